@@ -31,15 +31,18 @@ logger.bsdev(__file__)
 iconfig = get_config()
 
 instrument, oregistry = init_instrument("guarneri")
-oregistry.clear()
 
 aps_dm_setup(iconfig.get("DM_SETUP_FILE"))
 
-register_bluesky_magics()
-
 from id4_common.utils.local_magics import LocalMagics  # noqa: E402
 
-get_ipython().register_magics(LocalMagics)
+# A reload (e.g. %autoreload) keeps the module globals: do not empty the
+# device registry or register the magics again.
+if not globals().get("_startup_done", False):
+    oregistry.clear()
+    register_bluesky_magics()
+    get_ipython().register_magics(LocalMagics)
+    _startup_done = True
 
 from id4_common.utils.run_engine import RE  # noqa: E402
 from id4_common.utils.run_engine import bec  # noqa: F401, E402
@@ -112,6 +115,7 @@ else:
         temperature_setup,  # noqa: F401
     )
     from id4_common.utils.undulator_setup import undulator_setup  # noqa: F401
+    from id4_common.utils.wax import wa_multi  # noqa: F401
     from id4_common.utils.wax import wa_new  # noqa: F401
     from id4_common.utils.wax import wax  # noqa: F401
     from id4_common.utils.wax import wm  # noqa: F401
@@ -123,6 +127,7 @@ else:
 
     from id4_common.plans import *  # noqa: F403
     from id4_common.utils.device_loader import connect_device  # noqa: F401
+    from id4_common.utils.device_loader import connect_devices  # noqa: F401
     from id4_common.utils.device_loader import (
         find_loadable_devices,  # noqa: F401
     )
@@ -131,6 +136,9 @@ else:
     from id4_common.utils.device_loader import reload_all_devices  # noqa: F401
     from id4_common.utils.device_loader import remove_device  # noqa: F401
     from id4_common.utils.hkl_utils_hklpy2 import *  # noqa: F403
+    from id4_common.utils.load_vortex import (
+        join_vortex_connections,  # noqa: F401
+    )
     from id4_common.utils.load_vortex import load_vortex  # noqa: F401
     from id4_common.utils.logbook_mcr import *  # noqa: F403
     from id4_common.utils.oregistry_auxiliar import get_devices  # noqa: F401
@@ -44,8 +44,7 @@ try:
             connect=False,
         )
         stations = ["core", "4idb", "4idg", "4idh"]
-        for device in oregistry.findall(stations):  # noqa: F405
-            connect_device(device, raise_error=False)  # noqa: F405
+        connect_devices(oregistry.findall(stations))  # noqa: F405
 
         counters.plotselect(11, 0)  # noqa: F405
 
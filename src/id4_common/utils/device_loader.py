@@ -1,8 +1,11 @@
 """Device loading, connecting, and registry management utilities."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from logging import getLogger
 from pathlib import Path
+from threading import Lock
 
 import yaml
 from apsbits.core.instrument_init import oregistry
@@ -21,6 +24,8 @@ logger = getLogger(__name__)
 DEFAULT_FILE = Path(__file__).parent / "../configs/devices.yml"
 # Main namespace for dynamic imports
 MAIN_NAMESPACE = "__main__"
+# Guards oregistry and the baseline when devices connect in parallel
+_registry_lock = Lock()
 
 
 def load_yaml_devices(file=DEFAULT_FILE):
@@ -196,21 +201,22 @@ def connect_device(device, baseline=None, raise_error=True):
         if hasattr(device, "default_settings"):
             device.default_settings()
 
-        # Register device if not already registered
-        if oregistry.find(device.name, allow_none=True) is None:
-            oregistry.register(device)
+        with _registry_lock:
+            # Register device if not already registered
+            if oregistry.find(device.name, allow_none=True) is None:
+                oregistry.register(device)
 
-        # Add device to baseline if applicable
-        if baseline:
-            for dev in sd.baseline:
-                if dev.name == device.name:
-                    logger.info(
-                        f"Found a duplicated {device.name} name in the "
-                        "baseline. Removing the old one."
-                    )
-                    sd.baseline.remove(dev)
+            # Add device to baseline if applicable
+            if baseline:
+                for dev in sd.baseline:
+                    if dev.name == device.name:
+                        logger.info(
+                            f"Found a duplicated {device.name} name in the "
+                            "baseline. Removing the old one."
+                        )
+                        sd.baseline.remove(dev)
 
-            sd.baseline.append(device)
+                sd.baseline.append(device)
 
         cam = getattr(device, "cam", None)
         if cam is not None:
@@ -233,12 +239,37 @@ def connect_device(device, baseline=None, raise_error=True):
             f"Device {device.name} is disconnected, removing it from baseline."
         )
 
-        if device in sd.baseline:
-            sd.baseline.remove(device)
-            message += " This device was removed from the baseline."
+        with _registry_lock:
+            if device in sd.baseline:
+                sd.baseline.remove(device)
+                message += " This device was removed from the baseline."
         logger.warning(message)
 
 
+def connect_devices(devices, max_workers=32):
+    """
+    Connect several devices at once with :func:`connect_device`.
+
+    Devices not found in `AVAILABLE_DEVICES` are skipped. Each connection
+    mostly waits on Channel Access, so the devices are connected from a
+    thread pool and the waits overlap instead of adding up.
+
+    Parameters
+    ----------
+    devices : iterable
+        The device objects to connect.
+    max_workers : int, optional
+        Maximum number of devices connecting at the same time. Defaults to
+        32.
+    """
+    devices = list(devices)
+    if not devices:
+        return
+    workers = min(max_workers, len(devices))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(partial(connect_device, raise_error=False), devices))
+
+
 def load_device(name, file=None):
     """
     Load and connect a device by its name from a YAML configuration file.
@@ -418,8 +449,7 @@ def reload_all_devices(file="devices.yml", stations=None):
     # Create the devices.
     RE(make_devices(clear=True, file=file, connect=False))
 
-    for device in oregistry.findall(stations):
-        connect_device(device, raise_error=False)
+    connect_devices(oregistry.findall(stations))
 
 
 def remove_device(device):
@@ -50,6 +50,7 @@ import asyncio
 import logging
 import math
 import pathlib
+from contextlib import contextmanager
 
 import yaml
 
@@ -117,9 +118,11 @@ __all__ = """
     set_diffractometer
 """.split()
 
-polar_config = pathlib.Path("polar-config.json")
+# write_config()/read_config(): ``<name>_polar_config.yml`` in the cwd
+_CONFIG_SUFFIX = "_polar_config.yml"
 
-RE = RunEngine({}, loop=asyncio.new_event_loop())
+# Private RunEngine for ubr()/uan(); created on first use by _get_RE().
+_RE = None
 pbar_manager = ProgressBarManager()
 
 logging.getLogger("hklpy2").setLevel(logging.WARNING)
@@ -127,9 +130,20 @@ logging.getLogger("hklpy2").setLevel(logging.WARNING)
 
 
 class Geometries:
-    """Register the diffractometer geometries."""
+    """
+    Register the diffractometer geometries.
 
-    configuration_wrapper = None
+    Only the device names are stored; each property looks its device up in
+    the registry when read, so the devices need not exist at import time.
+    """
+
+    __slots__ = (
+        "_huber_euler",
+        "_huber_euler_psi",
+        "_huber_hp",
+        "_huber_hp_psi",
+        "configuration_wrapper",
+    )
 
     def __init__(
         self, huber_euler_nm, huber_euler_psi_nm, huber_hp_nm, huber_hp_psi_nm
@@ -138,6 +152,7 @@ class Geometries:
         self._huber_euler_psi = huber_euler_psi_nm
         self._huber_hp = huber_hp_nm
         self._huber_hp_psi = huber_hp_psi_nm
+        self.configuration_wrapper = None
 
     @property
     def huber_euler(self):
@@ -178,6 +193,179 @@ geometries = Geometries(
 
 _DIFFRACTOMETER_NAMES = ["huber_euler", "huber_hp"]
 
+# Display order of the six-circle real axes
+_SIX_CIRCLE_REALS = ("gamma", "mu", "chi", "phi", "delta", "tau")
+
+# or0()/or1(): H, K, L offered when no orienting reflection exists yet
+_DEFAULT_ORIENTING_HKL = ((2, 0, 0), (0, 2, 0))
+
+# All six lattice parameters, as Lattice.system_parameter_names() lists them
+# for a triclinic (or unspecified) crystal system
+_LATTICE_PARAMETERS = ("a", "b", "c", "alpha", "beta", "gamma")
+
+# update_lattice(): the only non-zero (rounded) Miller index -> parameter
+_AUTO_LATTICE_PARAMETER = {
+    (True, False, False): "a",
+    (False, True, False): "b",
+    (False, False, True): "c",
+}
+
+# Modes that hold psi constant; their psi is kept in core.extras
+_PSI_CONSTANT_MODES = (
+    "psi constant",
+    "psi constant vertical",
+    "psi constant horizontal",
+)
+
+# diffractometer name -> (diffractometer, psi-engine counterpart)
+_PSI_GEOMETRIES = {}
+
+# (index width, pseudo axes, real column labels) -> (header, row template)
+_REFLECTION_FORMATS = {}
+
+
+def _psi_geometry(geom):
+    """
+    Return the ``<name>_psi`` counterpart of ``geom`` from the registry.
+
+    The lookup is cached per diffractometer. An entry is reused only while
+    ``geom`` is the same object it was cached for, so reloaded devices are
+    looked up again. set_diffractometer() clears the cache.
+    """
+    cached = _PSI_GEOMETRIES.get(geom.name)
+    if cached is not None and cached[0] is geom:
+        return cached[1]
+    psi_geom = oregistry.find(geom.name + "_psi")
+    _PSI_GEOMETRIES[geom.name] = (geom, psi_geom)
+    return psi_geom
+
+
+def _reflection_values(ref, reals_order=None):
+    """
+    Return ``(pseudos, reals)`` of a reflection as two tuples.
+
+    ``reals_order`` selects and orders the real axes by name; by default
+    they come in the reflection's own order.
+    """
+    reals = ref.reals
+    if reals_order is None:
+        real_values = tuple(reals.values())
+    else:
+        real_values = tuple(reals[k] for k in reals_order)
+    return tuple(ref.pseudos.values()), real_values
+
+
+def _reflection_formats(pseudo_names, real_labels, idx_width=3):
+    """
+    Return the header and the row template of a reflection table.
+
+    Built once per column layout and cached. The row template is a
+    ``str.format`` string taking the index (or name), the pseudo values
+    and the real values, in that order.
+    """
+    key = (idx_width, tuple(pseudo_names), tuple(real_labels))
+    formats = _REFLECTION_FORMATS.get(key)
+    if formats is None:
+        header = (
+            f"\n{'#':>{idx_width}}"
+            + "".join(f"{m:>9}" for m in pseudo_names).upper()
+            + "".join(f"{k:>10}" for k in real_labels)
+            + "   orienting"
+        )
+        row = (
+            f"{{:>{idx_width}}}"
+            + "{:9.3f}" * len(pseudo_names)
+            + "{:10.3f}" * len(real_labels)
+        )
+        formats = _REFLECTION_FORMATS[key] = (header, row)
+    return formats
+
+
+def _reflection_layout(geom, idx_width=3):
+    """
+    Return ``(header, row_fmt, reals_order)`` of a reflection table.
+
+    Six-circle geometries list their reals in ``_SIX_CIRCLE_REALS`` order,
+    other geometries in their own order.
+    """
+    if len(geom.real_positioners) == 6:
+        reals_order = _SIX_CIRCLE_REALS
+        labels = [k.capitalize() for k in reals_order]
+    else:
+        reals_order = None
+        labels = geom.real_positioners._fields
+    header, row_fmt = _reflection_formats(
+        geom.pseudo_positioners._fields, labels, idx_width
+    )
+    return header, row_fmt, reals_order
+
+
+def _reflection_row(row_fmt, reals_order, idx, key, ref, orienting_refl):
+    """
+    Format one reflection table row.
+
+    The row is tagged "first" or "second" when ``key`` is one of the two
+    orienting reflections in ``orienting_refl``.
+    """
+    pseudos, reals = _reflection_values(ref, reals_order)
+    row = row_fmt.format(idx, *pseudos, *reals)
+    if orienting_refl and key == orienting_refl[0]:
+        return f"{row}   first"
+    if len(orienting_refl) > 1 and key == orienting_refl[1]:
+        return f"{row}   second"
+    return row
+
+
+def _prompt_many(labels, defaults, fmt="{}"):
+    """
+    Ask for several numbers with a single prompt.
+
+    Shows the ``label=default`` pairs and reads one comma-separated line with
+    exactly one field per label; an empty field keeps its default. An empty
+    line keeps all defaults. A line with the wrong number of fields or an
+    invalid number is rejected and asked again. Returns a list of floats.
+    """
+    shown = ", ".join(
+        f"{label}={fmt.format(default)}"
+        for label, default in zip(labels, defaults, strict=True)
+    )
+    while True:
+        line = input(f"{shown}\n  New values (comma separated, Enter keeps)? ")
+        if not line.strip():
+            return [float(default) for default in defaults]
+        fields = [field.strip() for field in line.split(",")]
+        if len(fields) != len(labels):
+            print(
+                f"Expected {len(labels)} comma-separated values, "
+                f"got {len(fields)}, try again."
+            )
+            continue
+        values = []
+        for label, raw, default in zip(labels, fields, defaults, strict=True):
+            try:
+                values.append(float(raw) if raw else float(default))
+            except ValueError:
+                print(f"Invalid {label}, try again.")
+                break
+        else:
+            return values
+
+
+def _ask_float(label, default):
+    """
+    Ask for one number, showing ``default``; Enter keeps the default.
+
+    Invalid entries are reported and asked again. Returns a float.
+    """
+    while True:
+        raw = input(f"{label} ({default})? ").strip()
+        if not raw:
+            return float(default)
+        try:
+            return float(raw)
+        except ValueError:
+            print(f"Invalid {label}, try again.")
+
 
 def set_diffractometer(diffractometer):
     """
@@ -191,11 +379,16 @@ def set_diffractometer(diffractometer):
     """
 
     hklpy2_set_diffract(diffractometer)
+    _PSI_GEOMETRIES.clear()
 
-    try:
-        polar_RE.preprocessors.remove(geometries.configuration_wrapper)
-    except ValueError:
-        pass
+    # Only the bound ``wrapper`` method is in the preprocessor list.
+    if geometries.configuration_wrapper is not None:
+        try:
+            polar_RE.preprocessors.remove(
+                geometries.configuration_wrapper.wrapper
+            )
+        except ValueError:
+            pass
 
     geometries.configuration_wrapper = ConfigurationRunWrapper(diffractometer)
     polar_RE.preprocessors.append(geometries.configuration_wrapper.wrapper)
@@ -242,11 +435,12 @@ def change_diffractometer(diffractometer=None):
 
     new_geom = oregistry.find(answer)
     set_diffractometer(new_geom)
-    print(f"Active diffractometer: {new_geom.name}")
+    geom_name = new_geom.name
+    print(f"Active diffractometer: {geom_name}")
 
-    if new_geom.name == "huber_euler":
+    if geom_name == "huber_euler":
         set_constraints(-1, 1, 0, 90, -20, 200, -180, 180, -2, 140, -5, 50)
-    elif new_geom.name == "huber_hp":
+    elif geom_name == "huber_hp":
         set_constraints(-1, 1, 0, 90, 80, 100, -7, 7, -2, 140, -5, 50)
 
     aliases = {
@@ -263,7 +457,7 @@ def change_diffractometer(diffractometer=None):
             "achi": new_geom.ana.chi,
         }
     )
-    if new_geom.name == "huber_euler":
+    if geom_name == "huber_euler":
         aliases.update(
             {
                 "cryox": new_geom.x,
@@ -271,7 +465,7 @@ def change_diffractometer(diffractometer=None):
                 "cryoz": new_geom.z,
             }
         )
-    elif new_geom.name == "huber_hp":
+    elif geom_name == "huber_hp":
         aliases.update(
             {
                 "xeryon": new_geom.xeryon,
@@ -311,31 +505,10 @@ def newsample():
         print("Sample name cannot be empty.")
         return
 
-    # Default values
-    defaults = {
-        "a": 5.0,
-        "b": 5.0,
-        "c": 5.0,
-        "alpha": 90.0,
-        "beta": 90.0,
-        "gamma": 90.0,
-    }
-
-    def ask(name, default):
-        val = input(f"{name} ({default})? ") or default
-        try:
-            return float(val)
-        except ValueError:
-            print(f"Invalid {name}, keeping {default}")
-            return default
-
-    # Collect lattice parameters
-    a = ask("a", defaults["a"])
-    b = ask("b", defaults["b"])
-    c = ask("c", defaults["c"])
-    alpha = ask("alpha", defaults["alpha"])
-    beta = ask("beta", defaults["beta"])
-    gamma = ask("gamma", defaults["gamma"])
+    # Collect lattice parameters (defaults: 5 A cubic)
+    a, b, c, alpha, beta, gamma = _prompt_many(
+        _LATTICE_PARAMETERS, (5.0, 5.0, 5.0, 90.0, 90.0, 90.0)
+    )
 
     # Call your existing function
     add_sample(name, a=a, b=b, c=c, alpha=alpha, beta=beta, gamma=gamma)
@@ -367,18 +540,13 @@ def newsample():
 def sampleList():
     """List all samples currently defined in hklpy2; specify  current one."""
     _geom_ = get_diffractometer()
-    samples = _geom_.samples
-    print("")
-    for nm, sample in samples.items():
-        #        orienting_refl = samples[x].reflections
-        print(f"Sample = {nm}")
-        print("Lattice:", end=" ")
-        #        print(*samples[x].lattice._fields, sep=", ", end=" = ")
-        print(sample.lattice)
-        print(
-            "======================================================================"
-        )
-    print("\nCurrent sample: " + _geom_.sample.name)
+    lines = [""]
+    for nm, sample in _geom_.samples.items():
+        lines.append(f"Sample = {nm}")
+        lines.append(f"Lattice: {sample.lattice}")
+        lines.append("=" * 70)
+    lines.append("\nCurrent sample: " + _geom_.sample.name)
+    print("\n".join(lines))
 
 
 def sampleChange(sample_key=None):
@@ -393,10 +561,9 @@ def sampleChange(sample_key=None):
     """
     _geom_ = get_diffractometer()
     if sample_key is None:
-        d = _geom_.samples.keys()
-        print("Sample keys:", list(d))
+        print("Sample keys:", list(_geom_.samples))
         sample_key = (
-            input("\nEnter sample key [{}]: ".format(_geom_.sample.name))
+            input(f"\nEnter sample key [{_geom_.sample.name}]: ")
             or _geom_.sample.name
         )
     try:
@@ -421,17 +588,16 @@ def sampleRemove(sample_key=None):
     """
     _geom_ = get_diffractometer()
     if sample_key is None:
-        d = _geom_.samples.keys()
-        print("Sample keys:", list(d))
+        print("Sample keys:", list(_geom_.samples))
         sample_key = input(
-            "\nEnter sample key to remove [{}]: ".format(_geom_.sample.name)
+            f"\nEnter sample key to remove [{_geom_.sample.name}]: "
         )
         if sample_key == _geom_.sample.name:
             print("The current sample cannot be removed.")
             sample_key = " "
     try:
         _geom_.samples.pop(sample_key)  # remove the sample
-        print("\n[{}] sample is removed.".format(sample_key))
+        print(f"\n[{sample_key}] sample is removed.")
 
     except KeyError:
         print("Not a valid sample key")
@@ -450,64 +616,26 @@ def list_reflections(all_samples=False):
     _geom_ = get_diffractometer()
     samples = _geom_.samples.values() if all_samples else [_geom_.sample]
 
+    # Header and row template are the same for every sample
+    header, row_fmt, reals_order = _reflection_layout(_geom_, idx_width=8)
+
+    lines = []
     for sample in samples:
-        print(f"Sample: {sample.name}")
+        lines.append(f"Sample: {sample.name}")
 
         orienting_refl = sample.reflections.order  # orientation reflection keys
 
-        # column widths
-        refl_width = 8
-        pseudo_width = 9  # for h, k, l
-        real_width = 10  # for motor positions
-
-        # Header
-        if len(_geom_.real_positioners) == 6:
-            real_headers = ["Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"]
-        else:
-            real_headers = list(_geom_.real_positioners._fields)
-        header = (
-            f"\n{'#':>{refl_width}}"
-            + "".join(
-                f"{m:>{pseudo_width}}"
-                for m in _geom_.pseudo_positioners._fields
-            ).upper()
-            + "".join(f"{k:>{real_width}}" for k in real_headers)
-            + "   orienting"
+        lines.append(header)
+        lines.extend(
+            _reflection_row(row_fmt, reals_order, key, key, ref, orienting_refl)
+            for key, ref in sample.reflections.items()
         )
-        print(header)
-
-        # Rows
-        for key, ref in sample.reflections.items():
-            h, k, l = list(ref.pseudos.values())
-            if len(_geom_.real_positioners) == 6:
-                reals = ref.reals
-                pos_vals = [
-                    reals["gamma"],
-                    reals["mu"],
-                    reals["chi"],
-                    reals["phi"],
-                    reals["delta"],
-                    reals["tau"],
-                ]
-            else:
-                pos_vals = list(ref.reals.values())
-
-            tag = ""
-            if orienting_refl and key == orienting_refl[0]:
-                tag = "first"
-            elif len(orienting_refl) > 1 and key == orienting_refl[1]:
-                tag = "second"
-
-            row = (
-                f"{key:>{refl_width}}"
-                f"{h:{pseudo_width}.3f}{k:{pseudo_width}.3f}{l:{pseudo_width}.3f}"
-                + "".join(f"{v:{real_width}.3f}" for v in pos_vals)
-                + (f"   {tag}" if tag else "")
-            )
-            print(row)
 
         if len(samples) > 1 and all_samples:
-            print("=" * 107)
+            lines.append("=" * 107)
+
+    # One write for the whole table
+    print("\n".join(lines))
 
 
 def or_swap():
@@ -519,6 +647,41 @@ def or_swap():
     compute_UB()
 
 
+# _calc_UB(): inputs and result of the last UB calculation
+_LAST_UB = {"inputs": None, "UB": None}
+
+
+def _calc_UB(sample, r0, r1):
+    """
+    Run ``sample.core.calc_UB(r0, r1)`` unless its inputs are unchanged.
+
+    The inputs are the sample, the two orienting reflections (names,
+    positions and wavelength) and the lattice. The previous result is kept
+    only while ``sample.UB`` still holds it, so a UB set by other means is
+    always recomputed. Returns True if UB was calculated.
+    """
+    refs = sample.reflections
+    inputs = (
+        id(sample),
+        r0,
+        r1,
+        tuple(getattr(sample.lattice, p) for p in _LATTICE_PARAMETERS),
+        *(
+            (*_reflection_values(refs[r]), getattr(refs[r], "wavelength", None))
+            for r in (r0, r1)
+        ),
+    )
+    if (
+        inputs == _LAST_UB["inputs"]
+        and tuple(map(tuple, sample.UB)) == _LAST_UB["UB"]
+    ):
+        return False
+    sample.core.calc_UB(r0, r1)
+    _LAST_UB["inputs"] = inputs
+    _LAST_UB["UB"] = tuple(map(tuple, sample.UB))
+    return True
+
+
 def compute_UB():
     """
     Calculates the UB matrix. v
@@ -533,16 +696,16 @@ def compute_UB():
         for it.
     """
     _geom_ = get_diffractometer()
-    _geom_for_psi_ = oregistry.find(_geom_.name + "_psi")
+    _geom_for_psi_ = _psi_geometry(_geom_)
 
     sample = _geom_.sample
     print("Computing UB...")
-    sample.core.calc_UB(
-        sample.reflections.order[0], sample.reflections.order[1]
-    )
+    r0, r1 = sample.reflections.order[:2]
+    if not _calc_UB(sample, r0, r1):
+        print("Orienting reflections and lattice unchanged, UB kept.")
     Sync_UB_Matrix(_geom_, _geom_for_psi_)
-    first_ref = sample.reflections[sample.reflections.order[0]]
-    h, k, l = list(first_ref.pseudos.values())
+    first_ref = sample.reflections[r0]
+    h, k, l = first_ref.pseudos.values()
     _geom_.forward(h, k, l)
 
 
@@ -570,103 +733,116 @@ class Sync_UB_Matrix:
     def sync_callback(self, value=None, **kwargs):
         if value is None:
             return
-        print(f"Copy UB from {self.source.name} to {self.target.name}")
-        self.target.sample.UB = value
+        source, target = self.source, self.target
+        print(f"Copy UB from {source.name} to {target.name}")
+        target.sample.UB = value
 
         # Sync real motor positions if target has simulated motors
-        for axis_name in self.source.real_axis_names:
-            ptarget = getattr(self.target, axis_name, None)
+        for axis_name in source.real_axis_names:
+            ptarget = getattr(target, axis_name, None)
             if ptarget is not None and hasattr(ptarget, "move"):
-                psource = getattr(self.source, axis_name)
-                ptarget.move(psource.position)
+                ptarget.move(getattr(source, axis_name).position)
 
         # Sync the azimuthal reference reflection (h2, k2, l2) extras of
         # the psi constant mode. Read from source.core.all_extras so it
         # works regardless of source's current mode, then push to target
         # by temporarily switching to a psi-capable mode if needed.
-        src_extras = self.source.core.all_extras
+        src_extras = source.core.all_extras
         h2k2l2 = {
             k: src_extras[k] for k in ("h2", "k2", "l2") if k in src_extras
         }
         if len(h2k2l2) == 3:
-            psi_modes = [
-                m for m in self.target.core.modes if "psi" in m.lower()
-            ]
+            target_core = target.core
+            psi_modes = [m for m in target_core.modes if "psi" in m.lower()]
             if psi_modes:
-                saved_mode = self.target.core.mode
+                saved_mode = target_core.mode
                 if "psi" not in saved_mode.lower():
-                    self.target.core.mode = psi_modes[0]
+                    target_core.mode = psi_modes[0]
                 try:
-                    current_extras = self.target.core.extras
+                    current_extras = target_core.extras
                     merged = {**h2k2l2}
                     if "psi" in current_extras:
                         merged["psi"] = current_extras.get("psi", 0.0)
-                    self.target.core.extras = merged
+                    target_core.extras = merged
                 finally:
-                    self.target.core.mode = saved_mode
+                    target_core.mode = saved_mode
 
 
-def setor0():
+def _promote_to_slot(order, name, slot):
     """
-    Sets the primary orientation in hklpy2.
+    Return a copy of the reflection ``order`` with ``name`` in position
+    ``slot`` (0 or 1).
 
-    Parameters
-    ----------
-    diffractometer real motors : float, optional
-        Values of motor positions for current reflection. It will ask
-        for it.
-    h, k, l : float, optional
-        Values of H, K, L positions for current reflection. It will ask
-        for it.
+    The reflection previously in ``slot`` leaves the orienting pair and goes
+    to the end of the list; hklpy2 refuses an order that drops below two
+    reflections while the sample still has two or more.
+    """
+    order = [key for key in order if key != name]
+    if len(order) > slot:
+        order.append(order[slot])
+        order[slot] = name
+    else:
+        order.append(name)
+    return order
+
+
+def _set_orienting_reflection(slot, h=None, k=None, l=None, ask_reals=False):
+    """
+    Add a reflection and make it orienting reflection ``slot`` (0 or 1).
+
+    With ``ask_reals`` the motor positions are prompted for, defaulting to
+    the reflection currently in that slot; otherwise the current motor
+    positions are used. H, K, L are prompted for unless given. UB is
+    recomputed once both orienting reflections are defined.
     """
     _geom_ = get_diffractometer()
     sample = _geom_.sample
     orienting_refl = sample.reflections.order
     motors = _geom_.real_positioners._fields
-    ordered_reals = (
-        ("gamma", "mu", "chi", "phi", "delta", "tau")
-        if len(_geom_.real_positioners) == 6
-        else motors
-    )
-    if len(orienting_refl) > 0:
-        for key, ref in sample.reflections.items():
-            if key == orienting_refl[0]:
-                pos = {k: ref.reals[k] for k in ordered_reals}
-                old_h, old_k, old_l = list(ref.pseudos.values())
+    nreal = len(motors)
+    ordered_reals = _SIX_CIRCLE_REALS if nreal == 6 else motors
+
+    if len(orienting_refl) > slot:
+        old_hkl, old_reals = _reflection_values(
+            sample.reflections[orienting_refl[slot]], ordered_reals
+        )
+    else:
+        old_hkl = (0, 0, 0) if ask_reals else _DEFAULT_ORIENTING_HKL[slot]
+        old_reals = (0.0,) * nreal
+    old_h, old_k, old_l = old_hkl
+
+    if ask_reals:
+        print(f"Enter {('primary', 'secondary')[slot]}-reflection angles:")
+        *angles, h, k, l = _prompt_many(
+            (*ordered_reals, "H", "K", "L"),
+            (*old_reals, old_h, old_k, old_l),
+            fmt="{:.2f}",
+        )
+        inputs = dict(zip(ordered_reals, angles, strict=True))
+        reals = [inputs[m] for m in motors]
     else:
-        pos = {k: 0 for k in ordered_reals}
-        old_h = 0
-        old_k = 0
-        old_l = 0
-
-    print("Enter primary-reflection angles:")
-    inputs = {}
-    for m in ordered_reals:
-        temppos = input("{} = [{:6.2f}]: ".format(m, pos[m])) or pos[m]
-        inputs[m] = float(temppos)
-    or0pos = [inputs[m] for m in motors]
-    h = input("H = [{}]: ".format(old_h)) or old_h
-    k = input("K = [{}]: ".format(old_k)) or old_k
-    l = input("L = [{}]: ".format(old_l)) or old_l
+        reals = _geom_.real_position
+        if not h and not k and not l:
+            h = _ask_float("H", old_h)
+            k = _ask_float("K", old_k)
+            l = _ask_float("L", old_l)
 
     try:
-        _geom_.add_reflection(
-            (float(h), float(k), float(l)),
-            or0pos,
-        )
+        refl = _geom_.add_reflection((float(h), float(k), float(l)), reals)
     except Exception as e:
         print(f"Error adding reflection: {e}")
+        return
 
-    if len(orienting_refl) > 1:
-        sample.reflections.order.pop(0)
-        # sample.reflections.order.pop(-1)
-    sample.reflections.order.insert(0, list(sample.reflections.keys())[-1])
+    # add() replaces sample.reflections.order with a new list: reorder the
+    # current one and assign it back so the solver is updated.
+    order = _promote_to_slot(sample.reflections.order, refl.name, slot)
+    sample.reflections.order = order
 
-    if len(orienting_refl) > 2:
+    if len(order) >= 2:
         compute_UB()
 
 
-def setor1():
+def setor0():
     """
     Sets the primary orientation in hklpy2.
 
@@ -679,48 +855,23 @@ def setor1():
         Values of H, K, L positions for current reflection. It will ask
         for it.
     """
-    _geom_ = get_diffractometer()
-    sample = _geom_.sample
-    orienting_refl = sample.reflections.order
-    motors = _geom_.real_positioners._fields
-    ordered_reals = (
-        ("gamma", "mu", "chi", "phi", "delta", "tau")
-        if len(_geom_.real_positioners) == 6
-        else motors
-    )
-    if len(orienting_refl) > 1:
-        for key, ref in sample.reflections.items():
-            if key == orienting_refl[1]:
-                pos = {k: ref.reals[k] for k in ordered_reals}
-                old_h, old_k, old_l = list(ref.pseudos.values())
-    else:
-        pos = {k: 0 for k in ordered_reals}
-        old_h = 0
-        old_k = 0
-        old_l = 0
-
-    print("Enter secondary-reflection angles:")
-    inputs = {}
-    for m in ordered_reals:
-        temppos = input("{} = [{:6.2f}]: ".format(m, pos[m])) or pos[m]
-        inputs[m] = float(temppos)
-    or0pos = [inputs[m] for m in motors]
-    h = input("H = [{}]: ".format(old_h)) or old_h
-    k = input("K = [{}]: ".format(old_k)) or old_k
-    l = input("L = [{}]: ".format(old_l)) or old_l
+    _set_orienting_reflection(0, ask_reals=True)
 
-    try:
-        _geom_.add_reflection((float(h), float(k), float(l)), or0pos)
-    except Exception as e:
-        print(f"Error adding reflection: {e}")
 
-    if len(orienting_refl) > 1:
-        sample.reflections.order.pop(1)
-        # sample.reflections.order.pop(-1)
-    sample.reflections.order.insert(1, list(sample.reflections.keys())[-1])
+def setor1():
+    """
+    Sets the secondary orientation in hklpy2.
 
-    if len(orienting_refl) > 1:
-        compute_UB()
+    Parameters
+    ----------
+    diffractometer real motors : float, optional
+        Values of motor positions for current reflection. It will ask
+        for it.
+    h, k, l : float, optional
+        Values of H, K, L positions for current reflection. It will ask
+        for it.
+    """
+    _set_orienting_reflection(1, ask_reals=True)
 
 
 def or0(h=None, k=None, l=None):
@@ -733,30 +884,7 @@ def or0(h=None, k=None, l=None):
         Values of H, K, L positions for current reflection. If None, it will ask
         for it.
     """
-    _geom_ = get_diffractometer()
-    sample = _geom_.sample
-    orienting_refl = sample.reflections.order
-    if not h and not k and not l:
-        if len(orienting_refl) > 0:
-            for key, ref in sample.reflections.items():
-                if key == orienting_refl[0]:
-                    hr, kr, lr = list(ref.pseudos.values())
-        else:
-            hr = 2
-            kr = 0
-            lr = 0
-        h = (input("H ({})? ".format(hr)) if not h else h) or hr
-        k = (input("K ({})? ".format(kr)) if not k else k) or kr
-        l = (input("L ({})? ".format(lr)) if not l else l) or lr
-    _geom_.add_reflection((float(h), float(k), float(l)), _geom_.real_position)
-
-    if len(orienting_refl) > 1:
-        sample.reflections.order.pop(0)
-        # sample.reflections.order.pop(-1)
-        sample.reflections.order.insert(0, list(sample.reflections.keys())[-1])
-
-    if len(orienting_refl) > 2:
-        compute_UB()
+    _set_orienting_reflection(0, h, k, l)
 
 
 def or1(h=None, k=None, l=None):
@@ -769,30 +897,7 @@ def or1(h=None, k=None, l=None):
         Values of H, K, L positions for current reflection. If None, it will ask
         for it.
     """
-    _geom_ = get_diffractometer()
-    sample = _geom_.sample
-    orienting_refl = sample.reflections.order
-    if not h and not k and not l:
-        if len(orienting_refl) > 1:
-            for key, ref in sample.reflections.items():
-                if key == orienting_refl[1]:
-                    hr, kr, lr = list(ref.pseudos.values())
-        else:
-            hr = 0
-            kr = 2
-            lr = 0
-        h = (input("H ({})? ".format(hr)) if not h else h) or hr
-        k = (input("K ({})? ".format(kr)) if not k else k) or kr
-        l = (input("L ({})? ".format(lr)) if not l else l) or lr
-    _geom_.add_reflection((float(h), float(k), float(l)), _geom_.real_position)
-
-    if len(orienting_refl) > 2:
-        sample.reflections.order.pop(1)
-        # sample.reflections.order.pop(-1)
-        sample.reflections.order.insert(1, list(sample.reflections.keys())[-1])
-
-    if len(orienting_refl) > 1:
-        compute_UB()
+    _set_orienting_reflection(1, h, k, l)
 
 
 def set_orienting():
@@ -806,57 +911,25 @@ def set_orienting():
     sample = _geom_.sample
     orienting_refl = sample.reflections.order
 
-    # Column widths for alignment
-    idx_width = 3
-    pseudo_width = 9
-    real_width = 10
-
-    # Print header
-    ordered_reals = ("gamma", "mu", "chi", "phi", "delta", "tau")
-    real_headers = (
-        ["Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"]
-        if len(_geom_.real_positioners) == 6
-        else list(_geom_.real_positioners._fields)
-    )
-    header = (
-        f"\n{'#':>{idx_width}}"
-        + "".join(
-            f"{m:>{pseudo_width}}" for m in _geom_.pseudo_positioners._fields
-        ).upper()
-        + "".join(f"{k:>{real_width}}" for k in real_headers)
-        + "   orienting"
-    )
-    print(header)
+    header, row_fmt, reals_order = _reflection_layout(_geom_)
+    lines = [header]
+
+    keys = list(sample.reflections.keys())
+    key_index = {key: i for i, key in enumerate(keys)}
 
     # Find current orienting reflection indices (defaults: 0,1)
     or0_old, or1_old = 0, 1
     if len(orienting_refl) > 0:
-        or0_old = list(sample.reflections.keys()).index(orienting_refl[0])
+        or0_old = key_index[orienting_refl[0]]
     if len(orienting_refl) > 1:
-        or1_old = list(sample.reflections.keys()).index(orienting_refl[1])
+        or1_old = key_index[orienting_refl[1]]
 
     # Print reflection list
-    for i, (key, ref) in enumerate(sample.reflections.items()):
-        h, k, l = list(ref.pseudos.values())
-        pos = (
-            [ref.reals[k] for k in ordered_reals]
-            if len(_geom_.real_positioners) == 6
-            else list(ref.reals.values())
-        )
-
-        tag = ""
-        if len(orienting_refl) > 0 and key == orienting_refl[0]:
-            tag = "first"
-        elif len(orienting_refl) > 1 and key == orienting_refl[1]:
-            tag = "second"
-
-        row = (
-            f"{i:>{idx_width}}"
-            f"{h:{pseudo_width}.3f}{k:{pseudo_width}.3f}{l:{pseudo_width}.3f}"
-            + "".join(f"{v:{real_width}.3f}" for v in pos)
-            + (f"   {tag}" if tag else "")
-        )
-        print(row)
+    lines.extend(
+        _reflection_row(row_fmt, reals_order, i, key, ref, orienting_refl)
+        for i, (key, ref) in enumerate(sample.reflections.items())
+    )
+    print("\n".join(lines))
 
     # Prompt user for orienting reflections
     try:
@@ -866,8 +939,6 @@ def set_orienting():
         print("Invalid input, keeping old orienting reflections.")
         or0, or1 = or0_old, or1_old
 
-    keys = list(sample.reflections.keys())
-
     # Safely update orienting reflections
     if 0 <= or0 < len(keys):
         sample.reflections.order[0:1] = [keys[or0]]
@@ -893,51 +964,16 @@ def del_reflection():
     sample = _geom_.sample
     orienting_refl = sample.reflections.order
 
-    # Column widths for alignment
-    idx_width = 3
-    pseudo_width = 9
-    real_width = 10
-
-    # Print header
-    ordered_reals = ("gamma", "mu", "chi", "phi", "delta", "tau")
-    real_headers = (
-        ["Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"]
-        if len(_geom_.real_positioners) == 6
-        else list(_geom_.real_positioners._fields)
-    )
-    header = (
-        f"\n{'#':>{idx_width}}"
-        + "".join(
-            f"{m:>{pseudo_width}}" for m in _geom_.pseudo_positioners._fields
-        ).upper()
-        + "".join(f"{k:>{real_width}}" for k in real_headers)
-        + "   orienting"
-    )
-    print(header)
+    header, row_fmt, reals_order = _reflection_layout(_geom_)
+    lines = [header]
 
     # Print reflection list
     keys = list(sample.reflections.keys())
-    for i, (key, ref) in enumerate(sample.reflections.items()):
-        h, k, l = list(ref.pseudos.values())
-        pos = (
-            [ref.reals[k] for k in ordered_reals]
-            if len(_geom_.real_positioners) == 6
-            else list(ref.reals.values())
-        )
-
-        tag = ""
-        if len(orienting_refl) > 0 and key == orienting_refl[0]:
-            tag = "first"
-        elif len(orienting_refl) > 1 and key == orienting_refl[1]:
-            tag = "second"
-
-        row = (
-            f"{i:>{idx_width}}"
-            f"{h:{pseudo_width}.3f}{k:{pseudo_width}.3f}{l:{pseudo_width}.3f}"
-            + "".join(f"{v:{real_width}.3f}" for v in pos)
-            + (f"   {tag}" if tag else "")
-        )
-        print(row)
+    lines.extend(
+        _reflection_row(row_fmt, reals_order, i, key, ref, orienting_refl)
+        for i, (key, ref) in enumerate(sample.reflections.items())
+    )
+    print("\n".join(lines))
 
     # Prompt for index to delete
     try:
@@ -975,40 +1011,24 @@ def list_orienting():
         print("Not enough orienting reflections defined.")
         return
 
-    # Column widths for alignment
-    idx_width = 3
-    pseudo_width = 9
-    real_width = 10
-
-    # Print header
-    custom_positioners = ("gamma", "mu", "chi", "phi", "delta", "tau")
-    header = (
-        f"\n{'#':>{idx_width}}"
-        + "".join(
-            f"{m:>{pseudo_width}}" for m in _geom_.pseudo_positioners._fields
-        ).upper()
-        + "".join(f"{k.capitalize():>{real_width}}" for k in custom_positioners)
-        + "   orienting"
-    )
-    print(header)
+    header, row_fmt, reals_order = _reflection_layout(_geom_)
+    lines = [header]
 
     # Print only orienting reflections
-    keys = list(sample.reflections.keys())
-    for tag, key in zip(["first", "second"], orienting_refl[:2], strict=False):
-        if key not in sample.reflections:
-            continue
-        idx = keys.index(key)
-        ref = sample.reflections[key]
-        h, k, l = list(ref.pseudos.values())
-        pos = [ref.reals[k] for k in custom_positioners]
-
-        row = (
-            f"{idx:>{idx_width}}"
-            f"{h:{pseudo_width}.3f}{k:{pseudo_width}.3f}{l:{pseudo_width}.3f}"
-            + "".join(f"{v:{real_width}.3f}" for v in pos)
-            + f"   {tag}"
+    key_index = {key: i for i, key in enumerate(sample.reflections.keys())}
+    lines.extend(
+        _reflection_row(
+            row_fmt,
+            reals_order,
+            key_index[key],
+            key,
+            sample.reflections[key],
+            orienting_refl,
         )
-        print(row)
+        for key in orienting_refl[:2]
+        if key in key_index
+    )
+    print("\n".join(lines))
 
 
 def setmode(mode=None):
@@ -1023,16 +1043,14 @@ def setmode(mode=None):
     _geom_ = get_diffractometer()
     current_mode = _geom_.core.mode
     for index, item in enumerate(_geom_.core.modes):
-        print("{:2d}. {}".format(index + 1, item))
+        print(f"{index + 1:2d}. {item}")
         if current_mode == item:
             current_index = index
     if mode:
         _geom_.core.mode = _geom_.core.modes[int(mode) - 1]
-        print("\nSet mode to {}".format(mode))
+        print(f"\nSet mode to {mode}")
     else:
-        mode = input("\nMode ({})? ".format(current_index + 1)) or (
-            current_index + 1
-        )
+        mode = input(f"\nMode ({current_index + 1})? ") or (current_index + 1)
         _geom_.core.mode = _geom_.core.modes[int(mode) - 1]
 
     # Freeze the appropriate detector angle at 0 based on mode geometry.
@@ -1073,14 +1091,11 @@ def freeze(*args):
     Updates ``_geom_.core.presets`` or ``_geom_.core.extras`` as appropriate.
     """
     _geom_ = get_diffractometer()
-    current_mode = _geom_.core.mode
+    core = _geom_.core
+    current_mode = core.mode
 
-    if current_mode in (
-        "psi constant",
-        "psi constant vertical",
-        "psi constant horizontal",
-    ):
-        _geom_for_psi_ = oregistry.find(_geom_.name + "_psi")
+    if current_mode in _PSI_CONSTANT_MODES:
+        _geom_for_psi_ = _psi_geometry(_geom_)
         if len(args) == 0:
             psi = _geom_for_psi_.inverse(0).psi
         elif len(args) == 1:
@@ -1089,7 +1104,7 @@ def freeze(*args):
             raise ValueError(
                 "either no argument or a psi value needs to be provided."
             )
-        _geom_.core.extras = {"psi": psi}
+        core.extras = {"psi": psi}
         print(f"Psi = {psi}")
         return
 
@@ -1108,18 +1123,18 @@ def freeze(*args):
             raise ValueError(
                 f"either no argument or a {axis} value needs to be provided."
             )
-        _geom_.core.presets = {**_geom_.core.presets, axis: value}
+        core.presets = {**core.presets, axis: value}
         print(f"{axis.capitalize()} = {value}")
         return
 
-    constant_axes = _geom_.core.constant_axis_names
+    constant_axes = core.constant_axis_names
 
     if not constant_axes:
         print(f"Mode '{current_mode}' has no constant (frozen) axes.")
         return
 
     print(f"Mode: {current_mode}")
-    current_presets = _geom_.core.presets
+    current_presets = core.presets
     new_presets = {}
 
     for axis in constant_axes:
@@ -1131,7 +1146,7 @@ def freeze(*args):
             print(f"  Invalid value for '{axis}', keeping {current_val}")
             new_presets[axis] = float(current_val)
 
-    _geom_.core.presets = new_presets
+    core.presets = new_presets
     print("Frozen angles:")
     for axis, val in new_presets.items():
         print(f"  {axis} = {val}")
@@ -1186,13 +1201,7 @@ def ca(h, k, l):
     else:
         # print(pos)
         print("\n   Calculated Positions:")
-        print(
-            "\n   H K L = {:5f}, {:5f}, {:5f}".format(
-                h,
-                k,
-                l,
-            )
-        )
+        print(f"\n   H K L = {h:5f}, {k:5f}, {l:5f}")
         print(
             f"\n   Lambda (Energy) = {_geom_.beam.wavelength.get():6.4f} \u212b"
             f" ({_geom_.beam.energy.get():6.4f}) keV"
@@ -1202,24 +1211,18 @@ def ca(h, k, l):
                 zip(_geom_.real_positioners._fields, pos, strict=False)
             )
             print(
-                "\n{:>9}{:>9}{:>9}{:>9}{:>9}{:>9}".format(
-                    "Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"
-                )
-            )
-            print(
-                "{:>9.3f}{:>9.3f}{:>9.3f}{:>9.3f}{:>9.3f}{:>9.3f}".format(
-                    pos_dict["gamma"],
-                    pos_dict["mu"],
-                    pos_dict["chi"],
-                    pos_dict["phi"],
-                    pos_dict["delta"],
-                    pos_dict["tau"],
-                )
+                f"\n{'Gamma':>9}{'Mu':>9}{'Chi':>9}"
+                f"{'Phi':>9}{'Delta':>9}{'Tau':>9}"
+                f"\n{pos_dict['gamma']:>9.3f}{pos_dict['mu']:>9.3f}"
+                f"{pos_dict['chi']:>9.3f}{pos_dict['phi']:>9.3f}"
+                f"{pos_dict['delta']:>9.3f}{pos_dict['tau']:>9.3f}"
             )
         else:
+            names = _geom_.real_positioners._fields
+            n = len(names)
             print(
-                f"\n{''.join(f'{k:>10}' for k in _geom_.real_positioners._fields)}"
-                f"\n{''.join(f'{v:>10.3f}' for v in pos)}"
+                f"\n{('{:>10}' * n).format(*names)}"
+                f"\n{('{:>10.3f}' * n).format(*pos)}"
             )
 
 
@@ -1231,20 +1234,19 @@ def _wh():
     in future releases.
     """
     _geom_ = get_diffractometer()
-    _geom_for_psi_ = oregistry.find(_geom_.name + "_psi")
+    _geom_for_psi_ = _psi_geometry(_geom_)
     _geom_for_psi_.sample.UB = _geom_.sample.UB
+    # One inverse calculation for all pseudo axes; each pseudo's
+    # .position would otherwise recompute the whole pseudo position.
+    pseudos = _geom_.position
     print(
-        f"\n   {' '.join(_geom_.pseudo_positioners._fields).upper()}"
-        f" = {', '.join([f'{v.position:5f}' for v in _geom_.pseudo_positioners])}"
+        f"\n   {' '.join(pseudos._fields).upper()}"
+        f" = {', '.join(f'{v:5f}' for v in pseudos)}"
     )
 
     # Snapshot the current (h, k, l) into uppercase H/K/L globals so the
     # user can reuse them at the prompt (e.g. `mv(diff.h, H+0.01, ...)`).
-    hkl_globals = {
-        "H": _geom_.h.position,
-        "K": _geom_.k.position,
-        "L": _geom_.l.position,
-    }
+    hkl_globals = {"H": pseudos.h, "K": pseudos.k, "L": pseudos.l}
     try:
         ip = get_ipython()  # — available in IPython / Bluesky sessions
         ip.push(hkl_globals)
@@ -1257,45 +1259,53 @@ def _wh():
     _rp_ = _geom_.real_positioners
     if len(_rp_) == 6:
         print(
-            "\n{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}".format(
-                "Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"
-            )
-        )
-        print(
-            "{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}".format(
-                _rp_.gamma.position,
-                _rp_.mu.position,
-                _rp_.chi.position,
-                _rp_.phi.position,
-                _rp_.delta.position,
-                _rp_.tau.position,
-            )
+            f"\n{'Gamma':>10}{'Mu':>10}{'Chi':>10}"
+            f"{'Phi':>10}{'Delta':>10}{'Tau':>10}"
+            f"\n{_rp_.gamma.position:>10.3f}{_rp_.mu.position:>10.3f}"
+            f"{_rp_.chi.position:>10.3f}{_rp_.phi.position:>10.3f}"
+            f"{_rp_.delta.position:>10.3f}{_rp_.tau.position:>10.3f}"
         )
     else:
+        names = _rp_._fields
+        n = len(names)
         print(
-            f"\n{''.join(f'{k:>10}' for k in _rp_._fields)}"
-            f"\n{''.join(f'{v.position:>10.3f}' for v in _rp_)}"
+            f"\n{('{:>10}' * n).format(*names)}"
+            f"\n{('{:>10.3f}' * n).format(*_geom_.real_position)}"
         )
+    extras = _geom_for_psi_.core.extras
+    _h2, _k2, _l2 = extras["h2"], extras["k2"], extras["l2"]
     print(
-        "\n   PSI = {:5.4f} ".format(
-            _geom_for_psi_.inverse(0).psi,
-        )
-    )
-    _h2, _k2, _l2 = _geom_for_psi_.core.extras.values()
-    print(
-        "   PSI reference vector = {:3.3f} {:3.3f} {:3.3f}".format(
-            _h2,
-            _k2,
-            _l2,
-        )
+        f"\n   PSI = {_geom_for_psi_.inverse(0).psi:5.4f} "
+        f"\n   PSI reference vector = {_h2:3.3f} {_k2:3.3f} {_l2:3.3f}"
     )
 
 
+def _get_RE():
+    """Return the RunEngine used by ubr()/uan(), creating it on first use."""
+    global _RE
+    if _RE is None:
+        _RE = RunEngine({}, loop=asyncio.new_event_loop())
+    return _RE
+
+
 def _ensure_idle():
-    if RE.state != "idle":
-        print("The RunEngine invoked by magics cannot be resumed.")
-        print("Aborting...")
-        RE.abort()
+    RE = _get_RE()
+    if RE.state == "idle":
+        return
+    print("The RunEngine invoked by magics cannot be resumed.\nAborting...")
+    RE.abort()
+
+
+@contextmanager
+def _pbar_RE():
+    """Yield the RunEngine with the progress bar on; leave it idle after."""
+    RE = _get_RE()
+    RE.waiting_hook = pbar_manager
+    try:
+        yield RE
+    finally:
+        RE.waiting_hook = None
+        _ensure_idle()
 
 
 def ubr(h, k, l):
@@ -1312,13 +1322,11 @@ def ubr(h, k, l):
     """
     _geom_ = get_diffractometer()
     plan = mv(_geom_.h, float(h), _geom_.k, float(k), _geom_.l, float(l))
-    RE.waiting_hook = pbar_manager
-    try:
-        RE(plan)
-    except RunEngineInterrupted:
-        ...
-    RE.waiting_hook = None
-    _ensure_idle()
+    with _pbar_RE() as RE:
+        try:
+            RE(plan)
+        except RunEngineInterrupted:
+            ...
     return None
 
 
@@ -1345,42 +1353,42 @@ def br(h, k, l):
 
 def uan(*args):
     """
-    Moves the delta and eta motors.
+    Moves the detector and sample rotation motors.
 
-    WARNING: This function will only work with six circles. This will be fixed
-    in future releases.
+    Six-circle diffractometers move (gamma, mu), four-circles (tth, th).
 
     Parameters
     ----------
-    delta, eta: float, optional??
-        Delta and eta motor angles to be moved to.
+    tth, th : float
+        Detector and sample angles to be moved to.
 
     Returns
     -------
     """
-    _geom_ = get_diffractometer()
     if len(args) != 2:
-        tth, th = args
-        raise ValueError("Usage: uan(gamma,mu))")
+        raise ValueError("Usage: uan(tth, th)")
+    tth, th = args
+    _geom_ = get_diffractometer()
+    nreal = len(_geom_.real_position)
+    if nreal == 6:
+        print(f"Moving to (gamma,mu)=({tth},{th})")
+        plan = mv(_geom_.gamma, tth, _geom_.mu, th)
+    elif nreal == 4:
+        print(f"Moving to (tth,th)=({tth},{th})")
+        plan = mv(_geom_.tth, tth, _geom_.th, th)
     else:
-        tth, th = args
-        if len(_geom_.real_position) == 6:
-            print("Moving to (gamma,mu)=({},{})".format(tth, th))
-            plan = mv(_geom_.gamma, tth, _geom_.mu, th)
-        elif len(_geom_.real_position) == 4:
-            print("Moving to (tth,th)=({},{})".format(tth, th))
-            plan = mv(_geom_.tth, tth, _geom_.th, th)
-    RE.waiting_hook = pbar_manager
-    try:
-        RE(plan)
-    except RunEngineInterrupted:
-        ...
-    RE.waiting_hook = None
-    _ensure_idle()
+        raise ValueError(
+            f"uan() supports four- and six-circle geometries, not {nreal} axes."
+        )
+    with _pbar_RE() as RE:
+        try:
+            RE(plan)
+        except RunEngineInterrupted:
+            ...
     return None
 
 
-def setlat(*args):
+def setlat(*args, warmup=True):
     """
     Set the lattice constants for the current sample.
 
@@ -1390,6 +1398,10 @@ def setlat(*args):
         Lattice constants.
         - If all 6 are provided as arguments, they are used directly.
         - If none are provided, the user will be prompted interactively.
+    warmup : bool, optional
+        Run one forward calculation after recomputing UB so that wh()
+        works right away (see compute_UB). Scripts that call setlat
+        repeatedly can pass False to skip it. Defaults to True.
 
     Notes
     -----
@@ -1399,7 +1411,7 @@ def setlat(*args):
     sample = _geom_.sample
 
     # Current lattice values
-    param_names = sample.lattice.system_parameter_names(0)
+    param_names = _LATTICE_PARAMETERS
     current_values = [getattr(sample.lattice, p) for p in param_names]
 
     # Case 1: direct arguments
@@ -1408,14 +1420,8 @@ def setlat(*args):
 
     # Case 2: interactive input
     elif len(args) == 0:
-        new_values = []
-        for name, current in zip(param_names, current_values, strict=False):
-            try:
-                val = input(f"Lattice {name} ({current})? ") or current
-                new_values.append(float(val))
-            except ValueError:
-                print(f"Invalid input for {name}, keeping old value {current}.")
-                new_values.append(current)
+        print("Lattice parameters:")
+        new_values = _prompt_many(param_names, current_values)
 
     else:
         raise ValueError(
@@ -1427,12 +1433,13 @@ def setlat(*args):
         setattr(sample.lattice, name, float(val))
 
     # Recompute UB if orienting reflections exist
-    if len(sample.reflections.order) > 1:
+    orienting_refl = sample.reflections.order
+    if len(orienting_refl) > 1:
         print("Computing UB...")
-        sample.core.calc_UB(
-            sample.reflections.order[0], sample.reflections.order[1]
-        )
-        _geom_.forward(1, 0, 0)
+        r0, r1 = orienting_refl[:2]
+        _calc_UB(sample, r0, r1)
+        if warmup:
+            _geom_.forward(1, 0, 0)
 
     # Final confirmation
     print("\nUpdated lattice parameters:")
@@ -1456,27 +1463,20 @@ def setaz(*args):
         If not provided, the user will be prompted interactively.
     """
     _geom_ = get_diffractometer()
-    _geom_for_psi_ = oregistry.find(_geom_.name + "_psi")
+    _geom_for_psi_ = _psi_geometry(_geom_)
+    core = _geom_.core
 
     # Current reference values from the psi diffractometer
-    _h2, _k2, _l2 = list(_geom_for_psi_.core.extras.values())
+    psi_extras = _geom_for_psi_.core.extras
+    _h2, _k2, _l2 = psi_extras["h2"], psi_extras["k2"], psi_extras["l2"]
 
     # Parse input
     if len(args) == 3:
         h2, k2, l2 = args
     elif len(args) == 0:
-
-        def ask(name, current):
-            val = input(f"{name} = ({current})? ") or current
-            try:
-                return float(val)
-            except ValueError:
-                print(f"Invalid {name}, keeping {current}")
-                return float(current)
-
-        h2 = ask("H", _h2)
-        k2 = ask("K", _k2)
-        l2 = ask("L", _l2)
+        h2 = _ask_float("H", _h2)
+        k2 = _ask_float("K", _k2)
+        l2 = _ask_float("L", _l2)
     else:
         raise ValueError(
             "Either no arguments or exactly 3 arguments (h, k, l) must be provided."
@@ -1490,20 +1490,15 @@ def setaz(*args):
     # Always store h2/k2/l2 on the main diffractometer by temporarily
     # switching to psi constant horizontal (the only mode that accepts these
     # extras), preserving any existing psi value, then restoring the mode.
-    psi_modes = (
-        "psi constant",
-        "psi constant vertical",
-        "psi constant horizontal",
-    )
+    _saved_mode = core.mode
     current_psi = (
-        _geom_.core.extras.get("psi", 0.0)
-        if _geom_.core.mode in psi_modes
+        core.extras.get("psi", 0.0)
+        if _saved_mode in _PSI_CONSTANT_MODES
         else 0.0
     )
-    _saved_mode = _geom_.core.mode
-    _geom_.core.mode = "psi constant horizontal"
-    _geom_.core.extras = {**extras, "psi": current_psi}
-    _geom_.core.mode = _saved_mode
+    core.mode = "psi constant horizontal"
+    core.extras = {**extras, "psi": current_psi}
+    core.mode = _saved_mode
 
     psi = _geom_for_psi_.inverse(0).psi
     print(f"Reference vector = {h2} {k2} {l2} with Psi = {psi:3.2f}")
@@ -1514,13 +1509,12 @@ def show_constraints():
     Show constraints (low, high) and cut point for each real axis.
     """
     _geom_ = get_diffractometer()
-    axes = _geom_.real_axis_names
-    for axis in axes:
-        c = _geom_.core.constraints[axis]
+    constraints = _geom_.core.constraints
+    for axis in _geom_.real_axis_names:
+        c = constraints[axis]
         print(
-            "{:>10} - [{:>6}, {:>6}] cut={:>6}".format(
-                axis, c.low_limit, c.high_limit, c.cut_point
-            )
+            f"{axis:>10} - [{c.low_limit:>6}, {c.high_limit:>6}]"
+            f" cut={c.cut_point:>6}"
         )
 
 
@@ -1554,58 +1548,54 @@ def set_constraints(*args):
     """
     _geom_ = get_diffractometer()
     axes = _geom_.real_axis_names
+    constraints = _geom_.core.constraints
 
-    def _apply(axis, tokens):
-        """Set limits (and optionally cut) on `axis` from a 2- or 3-token list."""
-        c = _geom_.core.constraints[axis]
+    def _apply(c, tokens):
+        """Set limits (and optionally cut) on constraint `c` from 2-3 tokens."""
         c.limits = tokens[0], tokens[1]
         if len(tokens) >= 3:
             c.cut_point = float(tokens[2])
 
     if len(args) == 18:
         for n, axis in enumerate(axes):
-            _apply(axis, args[3 * n : 3 * n + 3])
+            _apply(constraints[axis], args[3 * n : 3 * n + 3])
 
     elif len(args) == 12:
         for n, axis in enumerate(axes):
-            _apply(axis, args[2 * n : 2 * n + 2])
+            _apply(constraints[axis], args[2 * n : 2 * n + 2])
 
     elif len(args) == 4:
         axis, low, high, cut = args
-        _apply(axis, (low, high, cut))
+        _apply(constraints[axis], (low, high, cut))
 
     elif len(args) == 3:
         axis, low, high = args
-        _apply(axis, (low, high))
+        _apply(constraints[axis], (low, high))
 
     elif len(args) == 1:
         axis = args[0]
-        c = _geom_.core.constraints[axis]
+        c = constraints[axis]
         low, high, cut = c.low_limit, c.high_limit, c.cut_point
         value = (
             input(
-                "{} constraints low, high, cut = "
-                "[{:3.3f}, {:3.3f}, {:3.3f}]: ".format(axis, low, high, cut)
+                f"{axis} constraints low, high, cut = "
+                f"[{low:3.3f}, {high:3.3f}, {cut:3.3f}]: "
             )
         ) or [low, high, cut]
         if isinstance(value, str):
             value = value.replace(",", " ").split()
-        _apply(axis, value)
+        _apply(c, value)
 
     elif len(args) == 0:
         for axis in axes:
-            c = _geom_.core.constraints[axis]
+            c = constraints[axis]
             low, high, cut = c.low_limit, c.high_limit, c.cut_point
             value = (
-                input(
-                    "{:>10} - [{:>6}, {:>6}] cut={:>6}: ".format(
-                        axis, low, high, cut
-                    )
-                )
+                input(f"{axis:>10} - [{low:>6}, {high:>6}] cut={cut:>6}: ")
             ) or [low, high, cut]
             if isinstance(value, str):
                 value = value.replace(",", " ").split()
-            _apply(axis, value)
+            _apply(c, value)
 
     print("New constraints:")
     show_constraints()
@@ -1636,7 +1626,7 @@ def analyzer_set():
     _geom_.ana.calc()
 
 
-def update_lattice(lattice_constant=None):
+def update_lattice(lattice_constant=None, warmup=True):
     """
     Update lattice constants.
 
@@ -1644,39 +1634,34 @@ def update_lattice(lattice_constant=None):
     ----------
     lattice_constant: string, optional
         a, b or c or auto (default)
+    warmup : bool, optional
+        Run one forward calculation after recomputing UB (see setlat).
+        Defaults to True.
     """
     _geom_ = get_diffractometer()
     sample = _geom_.sample
-    a = sample.lattice.a
-    b = sample.lattice.b
-    c = sample.lattice.c
-    alpha = sample.lattice.alpha
-    beta = sample.lattice.beta
-    gamma = sample.lattice.gamma
-    hh = _geom_.h.position
-    kk = _geom_.k.position
-    ll = _geom_.l.position
-
-    if round(hh) == 0 and round(kk) == 0:
-        lattice_auto = "c"
-    elif round(hh) == 0 and round(ll) == 0:
-        lattice_auto = "b"
-    elif round(kk) == 0 and round(ll) == 0:
-        lattice_auto = "a"
-    else:
-        lattice_auto = None
+    lattice = sample.lattice
+    pseudos = _geom_.position
+    hh, kk, ll = pseudos.h, pseudos.k, pseudos.l
+    rh, rk, rl = round(hh), round(kk), round(ll)
+
+    if rh == 0 and rk == 0 and rl == 0:
+        print("Auto calc not possible: H, K and L are all close to zero.")
+        return
+
+    lattice_auto = _AUTO_LATTICE_PARAMETER.get((rh != 0, rk != 0, rl != 0))
     if not lattice_constant:
         lattice_constant = (
             input("Lattice parameter (a, b, or c or [auto])? ") or lattice_auto
         )
     else:
         print("Specify lattice parameter 'a', 'b' or 'c' or none")
-    if lattice_constant == "a" and abs(round(hh)) > 0:
-        a = a / hh * round(hh)
-    elif lattice_constant == "b" and abs(round(kk)) > 0:
-        b = b / kk * round(kk)
-    elif lattice_constant == "c" and abs(round(ll)) > 0:
-        c = c / ll * round(ll)
+    if lattice_constant == "a" and rh != 0:
+        new_value = lattice.a / hh * rh
+    elif lattice_constant == "b" and rk != 0:
+        new_value = lattice.b / kk * rk
+    elif lattice_constant == "c" and rl != 0:
+        new_value = lattice.c / ll * rl
     else:
         if lattice_constant:
             print(
@@ -1688,36 +1673,23 @@ def update_lattice(lattice_constant=None):
             )
 
         return
-    print("Refining lattice parameter {}".format(lattice_constant))
-    sample.lattice.a = float(a)
-    sample.lattice.b = float(b)
-    sample.lattice.c = float(c)
-    sample.lattice.alpha = float(alpha)
-    sample.lattice.beta = float(beta)
-    sample.lattice.gamma = float(gamma)
-    if len(sample.reflections.order) > 1:
+    print(f"Refining lattice parameter {lattice_constant}")
+    # Only the refined parameter changes; the other five are left as-is.
+    setattr(lattice, lattice_constant, float(new_value))
+    orienting_refl = sample.reflections.order
+    if len(orienting_refl) > 1:
         print("Computing UB...")
-        sample.core.calc_UB(
-            sample.reflections.order[0],
-            sample.reflections.order[1],
-        )
-        _geom_.forward(1, 0, 0)
-    print(
-        "\n   H K L = {:5.4f} {:5.4f} {:5.4f}".format(
-            _geom_.h.position,
-            _geom_.k.position,
-            _geom_.l.position,
-        )
+        r0, r1 = orienting_refl[:2]
+        _calc_UB(sample, r0, r1)
+        if warmup:
+            _geom_.forward(1, 0, 0)
+    pseudos = _geom_.position
+    params = " ".join(
+        f"{getattr(lattice, name):5.4f}" for name in _LATTICE_PARAMETERS
     )
     print(
-        "   a, b, c, alpha, beta, gamma = {:5.4f} {:5.4f} {:5.4f} {:5.4f} {:5.4f} {:5.4f}".format(
-            sample.lattice.a,
-            sample.lattice.b,
-            sample.lattice.c,
-            sample.lattice.alpha,
-            sample.lattice.beta,
-            sample.lattice.gamma,
-        )
+        f"\n   H K L = {pseudos.h:5.4f} {pseudos.k:5.4f} {pseudos.l:5.4f}"
+        f"\n   {', '.join(_LATTICE_PARAMETERS)} = {params}"
     )
 
 
@@ -1727,18 +1699,21 @@ def write_config(filename="default", overwrite=False):
 
     Parameters
     ----------
-    method : string, optional
-        Only "File" is currently supported.
+    filename : string, optional
+        Prefix of the ``<filename>_polar_config.yml`` file. Defaults to
+        "default", the file read_config() offers first.
     overwrite : bool, optional
         If False, asks for confirmation before overwriting an existing file.
     """
-    _geom_ = get_diffractometer()
-    file = pathlib.Path(f"{filename}_polar_config.yml")
+    file = pathlib.Path(f"{filename}{_CONFIG_SUFFIX}")
     if file.exists() and not overwrite:
         answer = input(f"File '{file}' already exists. Overwrite? ([y]/n): ")
         if answer.strip().lower() == "n":
             print("Configuration file not written.")
             return
+    # Resolve and serialize the diffractometer only once the write is
+    # confirmed.
+    _geom_ = get_diffractometer()
     _geom_.export(str(file), comment="4-ID-G POLAR beamline")
     print(f"Configuration written to '{file}'.")
 
@@ -1751,11 +1726,11 @@ def read_config():
     one, and loads it. Defaults to default_polar_config.yml if it exists.
     """
     _geom_ = get_diffractometer()
-    files = sorted(pathlib.Path(".").glob("*_polar_config.yml"))
+    files = sorted(pathlib.Path(".").glob(f"*{_CONFIG_SUFFIX}"))
     if not files:
-        print("No *_polar_config.yml files found in current directory.")
+        print(f"No *{_CONFIG_SUFFIX} files found in current directory.")
         return
-    default_file = pathlib.Path("default_polar_config.yml")
+    default_file = pathlib.Path(f"default{_CONFIG_SUFFIX}")
     default_idx = next((i for i, f in enumerate(files) if f == default_file), 0)
     print("\nAvailable configuration files:")
     for i, f in enumerate(files):
@@ -1807,7 +1782,7 @@ def read_config():
 
     # Touch the psi-mode geometry so a missing entry surfaces here rather
     # than later inside compute_UB() / a scan plan.
-    _ = oregistry.find(_geom_.name + "_psi")
+    _ = _psi_geometry(_geom_)
     compute_UB()
 
 
@@ -1927,61 +1902,23 @@ def theta0():
     print("   CALCULATES ZERO-SHIFT AND A0 FOR CUBIC SYSTEMS\n")
 
     orienting_refl = sample.reflections.order
-    idx_width = 3
-    pseudo_width = 9
-    real_width = 10
 
-    if len(_geom_.real_positioners) == 6:
-        real_headers = ["Gamma", "Mu", "Chi", "Phi", "Delta", "Tau"]
-    else:
-        real_headers = list(_geom_.real_positioners._fields)
-
-    header = (
-        f"\n{'#':>{idx_width}}"
-        + "".join(
-            f"{m:>{pseudo_width}}" for m in _geom_.pseudo_positioners._fields
-        ).upper()
-        + "".join(f"{k:>{real_width}}" for k in real_headers)
-        + "   orienting"
-    )
-    print(header)
+    header, row_fmt, reals_order = _reflection_layout(_geom_)
+    lines = [header]
 
     keys = list(sample.reflections.keys())
-    for i, (key, ref) in enumerate(sample.reflections.items()):
-        h, k, l = list(ref.pseudos.values())  # noqa: E741
-        if len(_geom_.real_positioners) == 6:
-            reals = ref.reals
-            pos_vals = [
-                reals["gamma"],
-                reals["mu"],
-                reals["chi"],
-                reals["phi"],
-                reals["delta"],
-                reals["tau"],
-            ]
-        else:
-            pos_vals = list(ref.reals.values())
-
-        tag = ""
-        if orienting_refl and key == orienting_refl[0]:
-            tag = "first"
-        elif len(orienting_refl) > 1 and key == orienting_refl[1]:
-            tag = "second"
-
-        row = (
-            f"{i:>{idx_width}}"
-            f"{h:{pseudo_width}.3f}{k:{pseudo_width}.3f}"
-            f"{l:{pseudo_width}.3f}"
-            + "".join(f"{v:{real_width}.3f}" for v in pos_vals)
-            + (f"   {tag}" if tag else "")
-        )
-        print(row)
+    key_index = {key: i for i, key in enumerate(keys)}
+    lines.extend(
+        _reflection_row(row_fmt, reals_order, i, key, ref, orienting_refl)
+        for i, (key, ref) in enumerate(sample.reflections.items())
+    )
+    print("\n".join(lines))
 
     i1_old, i2_old = 0, 1
     if len(orienting_refl) > 0:
-        i1_old = keys.index(orienting_refl[0])
+        i1_old = key_index[orienting_refl[0]]
     if len(orienting_refl) > 1:
-        i2_old = keys.index(orienting_refl[1])
+        i2_old = key_index[orienting_refl[1]]
 
     try:
         i1 = int(input(f"\nFirst reflection ({i1_old})? ") or i1_old)
@@ -2000,17 +1937,15 @@ def theta0():
     ref1 = sample.reflections[keys[i1]]
     ref2 = sample.reflections[keys[i2]]
 
-    xh1, xk1, xl1 = list(ref1.pseudos.values())
-    xh2, xk2, xl2 = list(ref2.pseudos.values())
+    xh1, xk1, xl1 = ref1.pseudos.values()
+    xh2, xk2, xl2 = ref2.pseudos.values()
 
     if len(_geom_.real_positioners) == 6:
         zt1 = ref1.reals["gamma"]
         zt2 = ref2.reals["gamma"]
     else:
-        pos1 = list(ref1.reals.values())
-        pos2 = list(ref2.reals.values())
-        zt1 = pos1[0]
-        zt2 = pos2[0]
+        zt1 = next(iter(ref1.reals.values()))
+        zt2 = next(iter(ref2.reals.values()))
 
     xla = wavelength
 
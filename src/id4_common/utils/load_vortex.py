@@ -1,6 +1,8 @@
 """Utilities for loading and connecting Vortex detector devices."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from logging import getLogger
 
 from apsbits.core.instrument_init import oregistry
@@ -24,6 +26,38 @@ DETECTORS = {
     "xspress7": (VortexXspress37, "s4XSP3ME7:"),
 }
 
+# Background connections started by load_vortex(..., async_connect=True)
+_vortex_connect_pool = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="vortex_connect"
+)
+_pending = []
+
+
+def join_vortex_connections(timeout=None):
+    """
+    Wait for the connections started by ``load_vortex(async_connect=True)``.
+
+    PARAMETERS
+    ----------
+        timeout : float, optional
+            Maximum time to wait, in seconds. Defaults to no limit.
+    RETURNS
+    -------
+        pending : int
+            Number of connections still running when the wait ended.
+    """
+    done, not_done = wait(_pending, timeout=timeout)
+    for future in done:
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Vortex connection failed: %s", exc)
+    _pending[:] = not_done
+    if not_done:
+        logger.warning(
+            "%d vortex connection(s) still in progress.", len(not_done)
+        )
+    return len(not_done)
+
 
 def load_vortex(
     electronic: str,
@@ -31,6 +65,7 @@ def load_vortex(
     name: str = "vortex",
     labels: list = None,
     baseline: bool = False,
+    async_connect: bool = False,
     **kwargs,
 ):
     """
@@ -56,6 +91,11 @@ def load_vortex(
             Bluesky labels. Defaults to ["detector"].
         baseline : bool, optional
             Flag to add the device to the baseline. Defaults to False.
+        async_connect : bool, optional
+            Connect, set up and register the device in a background thread
+            and return right away, so several detectors connect in parallel.
+            Call ``join_vortex_connections()`` before using them. Defaults
+            to False.
     RETURNS
     -------
         vortex_detector : Ophyd device
@@ -95,7 +135,14 @@ def load_vortex(
     # the shared helper so vortex devices behave identically to anything
     # loaded via `load_device` (including the `_post_connect_setup` hook and
     # the HDF1 warmup wired up in each device's `default_settings`).
-    connect_device(device, baseline=baseline, raise_error=False)
+    if async_connect:
+        _pending.append(
+            _vortex_connect_pool.submit(
+                connect_device, device, baseline=baseline, raise_error=False
+            )
+        )
+    else:
+        connect_device(device, baseline=baseline, raise_error=False)
 
     # Always expose the device in `__main__`, matching `load_device`.  Even
     # if `connect_device` failed, the user gets the object back in their
@@ -1,6 +1,8 @@
 """IPython magic commands for motor control at the POLAR beamline."""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from operator import attrgetter
 
 from apsbits.core.instrument_init import oregistry
@@ -38,19 +40,29 @@ class LocalMagics(BlueskyMagics):
     @line_magic
     def wm(self, line):
         """Print position and travel limits for the named motors."""
+        motors = [
+            eval(arg, self.shell.user_ns)
+            for arg in re.split(r"[, ]+", line)
+            if arg
+        ]
+        # Read all motors at once rather than one PV round trip at a time.
+        readings = _call_concurrently(
+            [
+                signal.get
+                for m in motors
+                for signal in (
+                    m.user_readback,
+                    m.low_limit_travel,
+                    m.high_limit_travel,
+                )
+            ]
+        )
         result = Table()
         result.labels = ("Motor", "Position", "Limits")
-        for arg in re.split(r"[, ]+", line):
-            pos = eval(arg, self.shell.user_ns).user_readback.get()
-            llm = eval(arg, self.shell.user_ns).low_limit_travel.get()
-            hlm = eval(arg, self.shell.user_ns).high_limit_travel.get()
-            result.rows.append(
-                (
-                    eval(arg, self.shell.user_ns).name,
-                    f"{pos:.5f}",
-                    f"[{llm:.5f},{hlm:.5f}]",
-                )
-            )
+        for m, (pos, llm, hlm) in zip(
+            motors, partition(3, readings), strict=True
+        ):
+            result.rows.append((m.name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]"))
         print("")
         print(result.reST(fmt="markdown"))
 
@@ -62,10 +74,7 @@ class LocalMagics(BlueskyMagics):
                 "Wrong parameters. Expected: "
                 "%mov motor position (or several pairs like that)"
             )
-        args = []
-        for motor, pos in partition(2, line.split()):
-            args.append(eval(motor, self.shell.user_ns))
-            args.append(eval(pos, self.shell.user_ns))
+        args = [eval(arg, self.shell.user_ns) for arg in line.split()]
         plan = mv(*args)
         self.RE.waiting_hook = self.pbar_manager
         try:
@@ -84,10 +93,7 @@ class LocalMagics(BlueskyMagics):
                 "Wrong parameters. Expected: "
                 "%mov motor position (or several pairs like that)"
             )
-        args = []
-        for motor, pos in partition(2, line.split()):
-            args.append(eval(motor, self.shell.user_ns))
-            args.append(eval(pos, self.shell.user_ns))
+        args = [eval(arg, self.shell.user_ns) for arg in line.split()]
         plan = mvr(*args)
         self.RE.waiting_hook = self.pbar_manager
         try:
@@ -144,17 +150,15 @@ class LocalMagics(BlueskyMagics):
                 try:
                     # devices = devices_dict[labelb]
                     devices = oregistry.findall(label)
-                    all_children = [
-                        (k, getattr(obj, k))
-                        for obj in devices
-                        for k in getattr(obj, "read_attrs", [])
-                    ]
                 except KeyError:
                     print("<no matches for this label>")
                     continue
                 # Search devices and all their children for positioners.
-                positioners = [
-                    dev for dev in devices + all_children if is_positioner(dev)
+                positioners = [dev for dev in devices if is_positioner(dev)]
+                positioners += [
+                    getattr(obj, k)
+                    for obj in devices
+                    for k in _positioner_attrs(obj)
                 ]
                 if positioners:
                     _print_positioners(
@@ -169,6 +173,60 @@ class LocalMagics(BlueskyMagics):
                 print()  # blank line
 
 
+# (device class, read_attrs) -> names of the read_attrs that are positioners
+_POSITIONER_ATTRS = {}
+
+
+def _positioner_attrs(obj):
+    """Return the names of the children of ``obj`` that are positioners."""
+    read_attrs = tuple(getattr(obj, "read_attrs", ()))
+    key = (type(obj), read_attrs)
+    attrs = _POSITIONER_ATTRS.get(key)
+    if attrs is None:
+        attrs = _POSITIONER_ATTRS[key] = tuple(
+            k for k in read_attrs if is_positioner(getattr(obj, k))
+        )
+    return attrs
+
+
+def _call_concurrently(calls):
+    """Run zero-argument ``calls`` in a thread pool; return results in order."""
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with ThreadPoolExecutor(max_workers=min(32, len(calls))) as pool:
+        return list(pool.map(lambda call: call(), calls))
+
+
+def _returning_exception(call, *args):
+    """Return ``call(*args)``, or the exception it raised."""
+    try:
+        return call(*args)
+    except Exception as exc:
+        return exc
+
+
+# _print_positioners(): what is read from every positioner
+_POSITIONER_READS = (
+    attrgetter("position"),
+    attrgetter("limits"),
+    lambda p: p.user_offset.get(),
+)
+
+
+def _reads_own_pv(positioner):
+    """
+    Return True if ``positioner`` reads its position from its own PV.
+
+    Only these are read concurrently. A pseudo positioner (e.g. the h, k, l
+    of a diffractometer) computes its position through the parent's solver,
+    which is shared by its siblings and not thread safe.
+    """
+    readback = getattr(positioner, "user_readback", None)
+    if readback is None:
+        readback = getattr(positioner, "readback", None)
+    return getattr(readback, "pvname", None) is not None
+
+
 def _print_positioners(positioners, sort=True, precision=6, prefix=""):
     """
     This will take a list of positioners and try to print them.
@@ -188,18 +246,29 @@ def _print_positioners(positioners, sort=True, precision=6, prefix=""):
     if sort:
         positioners = sorted(set(positioners), key=attrgetter("name"))
 
-    values = []
+    # Read the EPICS positioners at once rather than one PV round trip at a
+    # time; the others one by one.
+    pooled = [p for p in positioners if _reads_own_pv(p)]
+    pooled_readings = _call_concurrently(
+        [
+            partial(_returning_exception, read, p)
+            for p in pooled
+            for read in _POSITIONER_READS
+        ]
+    )
+    readings = dict(zip(pooled, partition(3, pooled_readings), strict=True))
     for p in positioners:
-        try:
-            values.append(p.position)
-        except Exception as exc:
-            values.append(exc)
+        if p not in readings:
+            readings[p] = tuple(
+                _returning_exception(read, p) for read in _POSITIONER_READS
+            )
 
     headers = ["Positioner", "Value", "Low Limit", "High Limit", "Offset"]
     LINE_FMT = prefix + "{: <30} {: <11} {: <11} {: <11} {: <11}"
     lines = []
     lines.append(LINE_FMT.format(*headers))
-    for p, v in zip(positioners, values, strict=False):
+    for p in positioners:
+        v, limits, offset = readings[p]
         if not isinstance(v, Exception):
             try:
                 prec = int(p.precision)
@@ -213,17 +282,14 @@ def _print_positioners(positioners, sort=True, precision=6, prefix=""):
                 if len(value) > 1
                 else value[0]
             )
-            try:
-                low_limit, high_limit = p.limits
-            except Exception as exc:
-                low_limit = high_limit = exc.__class__.__name__
+            if isinstance(limits, Exception):
+                low_limit = high_limit = limits.__class__.__name__
             else:
+                low_limit, high_limit = limits
                 low_limit = round(low_limit, decimals=prec)
                 high_limit = round(high_limit, decimals=prec)
-            try:
-                offset = p.user_offset.get()
-            except Exception as exc:
-                offset = exc.__class__.__name__
+            if isinstance(offset, Exception):
+                offset = offset.__class__.__name__
             else:
                 offset = round(offset, decimals=prec)
         else:
@@ -22,15 +22,12 @@ def get_devices(label):
     :func:`ophydregistry.Registry.findall`
     """
 
-    objs = oregistry.findall(label=label, allow_none=True)
+    objs = oregistry.findall(label=label, allow_none=True) or []
     objs.sort(key=lambda x: x.name)  # Sort by name
-    table = {"Ophyd name": [], "PV prefix": [], "Label": []}
+    table = Table()
+    table.labels = ("Ophyd name", "PV prefix", "Label")
     for obj in objs:
-        table["Ophyd name"].append(obj.name)
-        if getattr(obj, "prefix", None):
-            table["PV prefix"].append(obj.prefix)
-        else:
-            table["PV prefix"].append("-None-")
-        table["Label"].append(obj._ophyd_labels_)
-
-    print(Table(table).reST(fmt="grid"))
+        prefix = getattr(obj, "prefix", None) or "-None-"
+        table.rows.append((obj.name, prefix, obj._ophyd_labels_))
+
+    print(table.reST(fmt="grid"))
@@ -2,6 +2,8 @@
 
 __all__ = ["pr_setup"]
 
+from concurrent.futures import ThreadPoolExecutor
+
 from apsbits.core.instrument_init import oregistry
 
 from ..callbacks.dichro_stream import plot_dichro_settings
@@ -76,10 +78,14 @@ class PRSetup:
         return prs
 
     def __repr__(self):
-        tracked = ""
-        for pr in oregistry.findall("phase retarder"):
-            if pr.tracking.get():
-                tracked += f"{pr.name} "
+        prs = self.available_prs
+        with ThreadPoolExecutor(max_workers=max(len(prs), 1)) as pool:
+            tracking = list(pool.map(lambda pr: pr.tracking.get(), prs))
+        tracked = "".join(
+            f"{pr.name} "
+            for pr, track in zip(prs, tracking, strict=True)
+            if track
+        )
 
         oscillate = self.positioner.name if self.positioner else "None"
         offset = self.offset.name if self.offset else "None"
@@ -1,34 +1,102 @@
 """Handler for SPE files"""
 
+from collections import OrderedDict
+from os.path import getsize
 from os.path import join
 
+import numpy as np
 from area_detector_handlers import HandlerBase
 from imageio.v3 import imread
 
+# Fixed binary header of SPE (v2 and LightField v3) files.
+_SPE_HEADER_SIZE = 4100
+# Header field -> (byte offset, dtype)
+_SPE_HEADER_FIELDS = {
+    "xdim": (42, "<u2"),
+    "datatype": (108, "<i2"),
+    "ydim": (656, "<u2"),
+    "xml_footer_offset": (678, "<u8"),
+    "NumFrames": (1446, "<i4"),
+    "file_header_ver": (1992, "<f4"),
+}
+# SPE datatype code -> pixel dtype
+_SPE_DATATYPES = {
+    0: np.float32,
+    1: np.int32,
+    2: np.int16,
+    3: np.uint16,
+    5: np.float64,
+    6: np.uint8,
+    8: np.uint32,
+}
+
+
+def read_spe(fname):
+    """
+    Return all frames of an SPE file as a ``(frames, ydim, xdim)`` array.
+
+    Only the header is read when the frames are stored back to back, and the
+    returned array is a read-only memory map whose pixel data stay on disk
+    until indexed. Any other layout (e.g. LightField per-frame metadata
+    between frames, or an unknown datatype) is read by imageio.
+    """
+    header = np.fromfile(fname, dtype=np.uint8, count=_SPE_HEADER_SIZE)
+    fields = {
+        name: np.frombuffer(header, dtype=dtype, count=1, offset=offset)[0]
+        for name, (offset, dtype) in _SPE_HEADER_FIELDS.items()
+    }
+    dtype = _SPE_DATATYPES.get(int(fields["datatype"]))
+    if dtype is None:
+        return imread(fname)
+
+    shape = (int(fields["NumFrames"]), int(fields["ydim"]), int(fields["xdim"]))
+    # The pixel data end at the XML footer (LightField, version 3 and up) or
+    # at the end of the file.
+    data_end = int(fields["xml_footer_offset"])
+    if fields["file_header_ver"] < 3 or data_end == 0:
+        data_end = getsize(fname)
+    frames_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    if frames_size == 0 or data_end != _SPE_HEADER_SIZE + frames_size:
+        return imread(fname)
+
+    return np.memmap(
+        fname, dtype=dtype, mode="r", offset=_SPE_HEADER_SIZE, shape=shape
+    )
+
 
 class SPEHandler(HandlerBase):
     """
     Area detector handler for SPE files produced by the LightField detector.
+
+    Frames are memory mapped rather than decoded where the file layout
+    allows it (see ``read_spe``); the most recently used ``max_cache_points``
+    files are kept open.
     """
 
     specs = {"AD_SPE_APSPolar"} | HandlerBase.specs
 
-    def __init__(self, fpath, template, filename, frame_per_point=1):
+    def __init__(
+        self, fpath, template, filename, frame_per_point=1, max_cache_points=16
+    ):
         """Initialize the SPE file handler with path, template, and filename."""
         self._path = join(fpath, "")
         self._fpp = frame_per_point
         self._template = template
         self._filename = filename
-        self._f_cache = dict()
+        self._max_cache = max_cache_points
+        self._f_cache = OrderedDict()
 
     def __call__(self, point_number):
         """Return image data for the given point number, using a file cache."""
-        if point_number not in self._f_cache:
+        data = self._f_cache.get(point_number)
+        if data is None:
             fname = self._template % (self._path, self._filename, point_number)
-            imgs = imread(fname)
-            self._f_cache[point_number] = imgs
-
-        data = self._f_cache[point_number]
+            data = read_spe(fname)
+            self._f_cache[point_number] = data
+            while len(self._f_cache) > self._max_cache:
+                self._f_cache.popitem(last=False)
+        else:
+            self._f_cache.move_to_end(point_number)
 
         if data.shape[0] != self._fpp:
             raise ValueError(
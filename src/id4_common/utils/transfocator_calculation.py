@@ -7,14 +7,24 @@ Transfocator functions.
 
 """
 
+from functools import lru_cache
+
 from hkl.user import current_diffractometer
+from numpy import interp
 from numpy import loadtxt
-from scipy.interpolate import interp1d
 
 BE_REFR_INDEX_FILE = (
     "/home/beams/POLAR/polar_instrument/src/instrument/utils/Be_refr_index.dat"
 )
 
+BANNER = "-" * 65
+
+
+@lru_cache(maxsize=None)
+def _load_delta_table(path):
+    """Return the (energies, deltas) columns of a refractive index file."""
+    return loadtxt(path, skiprows=2, usecols=(0, 1), unpack=True)
+
 
 def read_delta(energy=None, path=BE_REFR_INDEX_FILE):
     """
@@ -24,22 +34,47 @@ def read_delta(energy=None, path=BE_REFR_INDEX_FILE):
     if energy < 2700 or energy > 27000:
         raise ValueError("Energy {} out of range [2700, 27000].".format(energy))
 
-    energies, deltas = loadtxt(path, skiprows=2, usecols=(0, 1), unpack=True)
-    return interp1d(energies, deltas, kind="linear")(energy)
+    energies, deltas = _load_delta_table(path)
+    return interp(energy, energies, deltas)
 
 
-def transfocator_calc(
-    distance=None,
-    energy=None,
-    experiment="diffractometer",
-    beamline="polar",
-    verbose=True,
+def _print_report(
+    lenses_used,
+    iR,
+    distance,
+    distance_new,
+    energy,
+    source_sample_distance,
+    experiment,
 ):
+    """Print the lens selection and resulting focus of a CRL calculation."""
+    # convert rms source size to FWHM
+    magnification = distance_new / (source_sample_distance - distance_new)
+    fh = magnification * 21.8 * 2.35
+    fv = magnification * 4.1 * 2.35
+    lines = [
+        BANNER,
+        f"Inserted lens packages = {lenses_used}",
+        f"Effective radius = {1 / iR:3.1f} \u03bcm",
+        f"Position correction = {(distance - distance_new) / 1e3:6.1f} mm",
+        BANNER,
+        f"Distance CRLs to sample = {distance_new / 1e3:6.1f} mm "
+        f"at photon energy of {energy} eV",
+        BANNER,
+        f"Absolute sample position {source_sample_distance / 1e6:.1f} m "
+        f"from source at {experiment}",
+        "Approximate focus size in brightness mode "
+        f"{fh:.3f} \u03bcm x {fv:.3f} \u03bcm",
+        BANNER,
+    ]
+    print("\n".join(lines))
+
+
+def _distance_and_energy(distance, energy):
     """
-    Calculate the CRL lens configuration for the requested focus distance and
-    energy.
+    Return the sample distance (microns) and photon energy (eV) to use,
+    asking for the distance and reading the energy if not given.
     """
-    _geom_ = current_diffractometer()
     if not distance:
         distance = 1800
         distance = float(
@@ -51,17 +86,62 @@ def transfocator_calc(
         distance = distance * 1e3
     else:
         raise ValueError(
-            "Distance {} out of range [200, 10000].".format(energy)
+            "Distance {} out of range [200, 10000].".format(distance)
         )
 
     if not energy:
-        energy = _geom_.energy.get() * 1e3
+        energy = current_diffractometer().energy.get() * 1e3
     elif energy < 2600 or energy > 27000:
         raise ValueError(
             "Photon energy {} out of range [2600, 27000].".format(energy)
         )
-    else:
-        pass
+
+    return distance, energy
+
+
+def _compute_transfocator(
+    distance, energy, source_sample_distance, lens_types, lenses
+):
+    """
+    Select lens packages for a focus at distance (microns) and energy (eV).
+
+    Return the packages used (0/1 each), the effective 1/R (1/microns) and
+    the CRL to sample distance of that selection (microns).
+    """
+    source_crl_distance = source_sample_distance - distance
+    delta = read_delta(energy)
+    focus = source_crl_distance * distance / (source_crl_distance + distance)
+    iR_N = 1 / (2 * delta * focus)
+    iR = 0
+    lenses_used = []
+    # Greedy: a package is inserted if it fits under the target 1/R, and
+    # skipped otherwise (later, weaker packages may still fit).
+    for number, radius in zip(lenses, lens_types, strict=True):
+        value = number / radius
+        use = value < iR_N and iR < iR_N and iR + value <= iR_N + 0.001
+        lenses_used.append(int(use))
+        if use:
+            iR += value
+
+    focus_new = 1 / (2 * delta * iR)
+    distance_new = (
+        focus_new * source_crl_distance / (source_crl_distance - focus_new)
+    )
+    return lenses_used, iR, distance_new
+
+
+def transfocator_calc(
+    distance=None,
+    energy=None,
+    experiment="diffractometer",
+    beamline="polar",
+    verbose=True,
+):
+    """
+    Calculate the CRL lens configuration for the requested focus distance and
+    energy.
+    """
+    distance, energy = _distance_and_energy(distance, energy)
 
     if beamline == "polar":
         if experiment == "diffractometer":
@@ -89,59 +169,20 @@ def transfocator_calc(
     else:
         raise ValueError("Beamline {} not supported.".format(beamline))
 
-    source_crl_distance = source_sample_distance - distance
-    delta = read_delta(energy)
-    iradius_eff = []
-    focus = source_crl_distance * distance / (source_crl_distance + distance)
-    for num, value in enumerate(lens_types):
-        iradius_eff.append(lenses[num] / value)
-    iR_N = 1 / (2 * delta * focus)
-    iR = 0
-    lenses_used = []
-    for _, value in enumerate(iradius_eff):
-        lenses_used.append(0)
-        if value < iR_N and iR < iR_N:
-            lenses_used[-1] = 1
-            iR += value
-            if iR > iR_N + 0.001:
-                iR -= value
-                lenses_used[-1] = 0
-
-    focus_new = 1 / (2 * delta * iR)
-    distance_new = (
-        focus_new * source_crl_distance / (source_crl_distance - focus_new)
+    lenses_used, iR, distance_new = _compute_transfocator(
+        distance, energy, source_sample_distance, lens_types, lenses
     )
 
     if verbose:
-        print("-" * 65)
-        print("Inserted lens packages = {}".format(lenses_used))
-        print("Effective radius = {:3.1f} \u03bcm".format(1 / iR))
-        print(
-            "Position correction = {:6.1f} mm".format(
-                (distance - distance_new) / 1e3
-            )
-        )
-        print("-" * 65)
-        print(
-            "Distance CRLs to sample = {:6.1f} mm at photon energy of {} eV".format(
-                distance_new / 1e3, energy
-            )
-        )
-        print("-" * 65)
-        print(
-            "Absolute sample position {:.1f} m from source at {}".format(
-                source_sample_distance / 1e6, experiment
-            )
-        )
-        fh = (
-            distance_new / (source_sample_distance - distance_new) * 21.8 * 2.35
-        )  # convert rms source size to FWHM
-        fv = distance_new / (source_sample_distance - distance_new) * 4.1 * 2.35
-        print(
-            "Approximate focus size in brightness mode "
-            "{:.3f} \u03bcm x {:.3f} \u03bcm".format(fh, fv)
+        _print_report(
+            lenses_used,
+            iR,
+            distance,
+            distance_new,
+            energy,
+            source_sample_distance,
+            experiment,
         )
-        print("-" * 65)
 
     return lenses_used, (distance - distance_new) / 1e3
 
@@ -152,29 +193,7 @@ def transfocator_calc_old(
     """
     Calculate CRL lens configuration using the legacy (non-verbose) algorithm.
     """
-    _geom_ = current_diffractometer()
-    if not distance:
-        distance = 1800
-        distance = float(
-            input("Distance to sample in mm [{}]: ".format(distance))
-            or distance
-        )
-        distance = distance * 1e3
-    elif distance > 200 and distance < 10000:
-        distance = distance * 1e3
-    else:
-        raise ValueError(
-            "Distance {} out of range [200, 10000].".format(energy)
-        )
-
-    if not energy:
-        energy = _geom_.energy.get() * 1e3
-    elif energy < 2600 or energy > 27000:
-        raise ValueError(
-            "Photon energy {} out of range [2600, 27000].".format(energy)
-        )
-    else:
-        pass
+    distance, energy = _distance_and_energy(distance, energy)
 
     if beamline == "polar":
         if experiment == "diffractometer":
@@ -192,60 +211,24 @@ def transfocator_calc_old(
         # 4-ID: [1, 1, 1, 2, 4, 8, 8, 16]
         # 6-ID: [1, 1, 1, 2, 4, 8, 12, 16, 32]
         lenses = [1, 1, 1, 2, 4, 8, 8, 16]
-        lenses_used = [0, 0, 0, 0, 0, 0, 0, 0]
     elif beamline == "6-ID-B":
         lens_types = [1000, 500, 200, 200, 200, 200, 200, 200, 200]
         lenses = [1, 1, 1, 2, 4, 8, 12, 16, 32]
-        lenses_used = [0, 0, 0, 0, 0, 0, 0, 0, 0]
         source_sample_distance = 73.3e6
     else:
         raise ValueError("Beamline {} not supported.".format(beamline))
 
-    source_crl_distance = source_sample_distance - distance
-    delta = read_delta(energy)
-    iradius_eff = []
-    focus = source_crl_distance * distance / (source_crl_distance + distance)
-    for num, value in enumerate(lens_types):
-        iradius_eff.append(lenses[num] / value)
-    iR_N = 1 / (2 * delta * focus)
-    iR = 0
-    for num, value in enumerate(reversed(iradius_eff)):
-        if value < iR_N and iR < iR_N:
-            lenses_used[len(lenses) - num - 1] = 1
-            iR += value
-            if iR > iR_N + 0.001:
-                iR -= value
-                lenses_used[len(lenses) - num - 1] = 0
-    print("-" * 65)
-    print("Inserted lens packages = {}".format(lenses_used))
-    print("Effective radius = {:3.1f} \u03bcm".format(1 / iR))
-    focus_new = 1 / (2 * delta * iR)
-    distance_new = (
-        focus_new * source_crl_distance / (source_crl_distance - focus_new)
-    )
-    print(
-        "Position correction = {:6.1f} mm".format(
-            (distance - distance_new) / 1e3
-        )
-    )
-    print("-" * 65)
-    print(
-        "Distance CRLs to sample = {:6.1f} mm at photon energy of {} eV".format(
-            distance_new / 1e3, energy
-        )
-    )
-    print("-" * 65)
-    print(
-        "Absolute sample position {:.1f} m from source at {}".format(
-            source_sample_distance / 1e6, experiment
-        )
+    # The legacy selection starts from the last lens package.
+    lenses_used, iR, distance_new = _compute_transfocator(
+        distance, energy, source_sample_distance, lens_types[::-1], lenses[::-1]
     )
-    fh = (
-        distance_new / (source_sample_distance - distance_new) * 21.8 * 2.35
-    )  # convert rms source size to FWHM
-    fv = distance_new / (source_sample_distance - distance_new) * 4.1 * 2.35
-    print(
-        "Approximate focus size in brightness mode {:.3f} \u03bcm x {:.3f} "
-        "\u03bcm".format(fh, fv)
+    lenses_used.reverse()
+    _print_report(
+        lenses_used,
+        iR,
+        distance,
+        distance_new,
+        energy,
+        source_sample_distance,
+        experiment,
     )
-    print("-" * 65)
@@ -6,16 +6,22 @@ Transfocator functions.
     ~transfocator
 """
 
-from itertools import combinations
-
-from numpy import array
-from numpy import dot
-from numpy import eye
+from collections import namedtuple
+from functools import lru_cache
+
+from numpy import arange
+from numpy import argsort
+from numpy import concatenate
+from numpy import diff
+from numpy import errstate
+from numpy import flatnonzero
+from numpy import genfromtxt
 from numpy import inf
+from numpy import interp
 from numpy import loadtxt
-from pandas import DataFrame
-from pandas import read_csv
-from scipy.interpolate import interp1d
+from numpy import ones
+from numpy import unique
+from numpy import zeros
 
 BE_REFR_INDEX_FILE = (
     "/home/beams/POLAR/polar_instrument/src/instrument/utils/Be_refr_index.dat"
@@ -23,6 +29,28 @@ BE_REFR_INDEX_FILE = (
 
 LENS_SETTINGS = "/home/beams/POLAR/polar_instrument/src/instrument/utils/transfocator_settings.csv"
 
+# Lens packages of the transfocator, one array per settings file column
+# (radius and distance in microns).
+LensTable = namedtuple("LensTable", "index radius number distance")
+
+
+@lru_cache(maxsize=None)
+def _load_lens_table(path=LENS_SETTINGS):
+    """Return the columns of a transfocator settings file as a LensTable."""
+    table = genfromtxt(path, delimiter=",", skip_header=1, names=True)
+    return LensTable(
+        index=table["index"].astype(int),
+        radius=table["single_lens_radius"].astype(float),
+        number=table["number_of_lenses"].astype(float),
+        distance=table["distance"].astype(float),
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_delta_table(path):
+    """Return the (energies, deltas) columns of a refractive index file."""
+    return loadtxt(path, skiprows=2, usecols=(0, 1), unpack=True)
+
 
 def read_delta(energy, path=BE_REFR_INDEX_FILE):
     """
@@ -31,81 +59,192 @@ def read_delta(energy, path=BE_REFR_INDEX_FILE):
     if energy < 2700 or energy > 27000:
         raise ValueError("Energy {} out of range [2700, 27000].".format(energy))
 
-    energies, deltas = loadtxt(path, skiprows=2, usecols=(0, 1), unpack=True)
-    return interp1d(energies, deltas, kind="linear")(energy)
+    energies, deltas = _load_delta_table(path)
+    return interp(energy, energies, deltas)
+
+
+def _compute_effective_focal_length(powers, positions):
+    """
+    Compute the effective focal length of lenses with the given powers (1/f).
+
+    The 2x2 ray-transfer system matrix [[a, b], [c, d]] is updated in place,
+    one thin lens and one free-space propagation at a time. The C term only
+    depends on a and c, so b and d are not tracked.
+    """
+    a, c = 1.0, 0.0
+
+    # Multiply matrices for N lenses with spacing d between them
+    for i in range(len(powers) - 1):
+        # Apply lens matrix [[1, 0], [-1/f, 1]]
+        c -= a * powers[i]
+        # Apply propagation matrix [[1, dist], [0, 1]]
+        a += abs(positions[i + 1] - positions[i]) * c
+
+    # Last lens
+    c -= a * powers[-1]
+
+    # The C term gives the effective focal length
+    if c != 0:
+        return -1 / c
+    return inf  # If C is zero, the system is collimating
 
 
-def _lens_matrix(f):
-    """Return the transfer matrix for a thin lens with focal length f."""
-    return array([[1, 0], [-1 / f, 1]])
+def _subset_sums(values):
+    """Return the bit masks of all subsets of values and their sums."""
+    masks = arange(1 << len(values))
+    bits = (masks[:, None] >> arange(len(values))) & 1
+    return masks, bits @ values
 
 
-def _propagation_matrix(d):
-    """Return the transfer matrix for free-space propagation over distance d."""
-    return array([[1, d], [0, 1]])
+# Stacks of up to this many lenses have every subset checked exactly.
+_EXHAUSTIVE_MAX_LENSES = 16
 
 
-def _compute_effective_focal_length(focuses, positions):
+def _candidate_masks(powers, f_eff):
     """
-    Compute the effective focal length.
+    Return bit masks of the lens subsets to compare with the target focus.
+
+    Every non-empty subset is a candidate for stacks of up to
+    ``_EXHAUSTIVE_MAX_LENSES`` lenses; only larger stacks are pruned to the
+    subsets that bracket the target focus, as follows.
+
+    In the thin-lens approximation the power (1/focus) of a subset is the
+    sum of its lens powers. The subset sums are searched meet-in-the-middle:
+    the sums of both halves of the stack are enumerated, and for each left
+    sum the right sums on either side of the target power are found by
+    binary search. That gives 2 * 2**(N/2) candidates instead of 2**N, but
+    the lens spacing can make another subset closer for short focal lengths
+    (below about 0.3 m at POLAR).
     """
+    if len(powers) <= _EXHAUSTIVE_MAX_LENSES:
+        return arange(1, 1 << len(powers))
 
-    # Initialize system matrix as identity matrix
-    M = eye(2)
+    half = len(powers) // 2
+    left_masks, left_sums = _subset_sums(powers[:half])
+    right_masks, right_sums = _subset_sums(powers[half:])
+    order = argsort(right_sums)
+    right_masks, right_sums = right_masks[order], right_sums[order]
 
-    # Note that len(distances) = len(focuses)-1
-    distances = abs(positions[1:] - positions[:-1])
+    pos = right_sums.searchsorted(1 / f_eff - left_sums)
+    right = concatenate([pos - 1, pos]).clip(0, len(right_sums) - 1)
+    left = concatenate([left_masks, left_masks])
+    masks = unique(left | right_masks[right] << half)
+    return masks[masks != 0]
 
-    # Multiply matrices for N lenses with spacing d between them
-    for f, d in zip(focuses, distances, strict=False):
-        M = dot(_lens_matrix(f), M)  # Apply lens matrix
-        M = dot(_propagation_matrix(d), M)  # Apply propagation matrix
 
-    # Last lens
-    M = dot(_lens_matrix(focuses[-1]), M)
+def _subset_focal_lengths(masks, powers, positions):
+    """
+    Return the effective focal length of each lens subset (bit mask).
 
-    # Extract the (2,1) element (C term) to compute effective focal length
-    C = M[1, 0]
+    A lens left out of a subset acts as a lens of zero power, so every
+    subset is a pass through the same fixed stack of N lenses and spacings.
+    All subsets are propagated together, one lens at a time. Only the a and
+    c terms of the system matrix are needed for the C term.
+    """
+    a = ones(len(masks))
+    c = zeros(len(masks))
+    distances = abs(diff(positions))
+    for i, power in enumerate(powers):
+        c -= a * power * ((masks >> i) & 1)
+        if i < len(distances):
+            a += distances[i] * c
 
-    if C != 0:
-        f_eff = -1 / C
-    else:
-        f_eff = inf  # If C is zero, the system is collimating
+    with errstate(divide="ignore"):
+        focal_lengths = -1 / c
+    focal_lengths[c == 0] = inf  # If C is zero, the system is collimating
+    return focal_lengths
 
-    return f_eff
 
+def _find_optimal_combination(powers, positions, f_eff):
+    """
+    Return the rows of the lenses whose effective focal length is closest to
+    f_eff, and that focal length.
 
-def _find_optimal_combination(lenses, f_eff):
-    lenses_list = [i for _, i in lenses.iterrows()]
+    The lens spacing is not negligible for short focal lengths, so the
+    thin-lens candidates are compared using the exact ray-transfer
+    calculation.
+    """
+    masks = _candidate_masks(powers, f_eff)
+    if not len(masks):
+        return None, None
 
-    # Find the best combination of lens packages
-    best_combination = None
-    min_error = float("inf")
+    focal_lengths = _subset_focal_lengths(masks, powers, positions)
+    best = abs(focal_lengths - f_eff).argmin()
 
-    for r in range(len(lenses_list), 0, -1):
-        for lens_combination in combinations(lenses_list, r):
-            lens_combination = DataFrame(lens_combination)
+    rows = flatnonzero(masks[best] & 1 << arange(len(powers)))
+    return rows, focal_lengths[best]
 
-            focal_length = _compute_effective_focal_length(
-                lens_combination["focus"].values,
-                lens_combination["distance"].values,
-            )
 
-            # Calculate the error between the desired and actual focal length
-            error = abs(focal_length - f_eff)
+@lru_cache(maxsize=256)
+def _compute_solution(
+    energy,
+    optimize_position,
+    source_sample_distance,
+    reference_distance,
+    selected_lenses,
+):
+    """
+    Return the lens packages, effective radius, CRL to sample distance and
+    CRL Z position for one transfocator setup.
 
-            if error < min_error:
-                min_error = error
-                best_combination = list(lens_combination.index)
-                best_focal_length = focal_length
+    The lenses are optimized unless the ``selected_lenses`` tuple is given.
+    Results are cached, so repeating a setup (e.g. at every step of a scan)
+    does not repeat the lens search.
+    """
+    delta = read_delta(energy * 1e3)  # delta table uses eV.
 
-    return best_combination, best_focal_length
+    # Effective focal point for the desired distance
 
+    optimize_distance = (
+        optimize_position + reference_distance
+    ) * 1e3  # microns
 
-def _find_optimal_focus(lenses):
-    return _compute_effective_focal_length(
-        lenses["focus"].values,
-        lenses["distance"].values,
+    source_crl_distance = source_sample_distance - optimize_distance
+    f_eff = (
+        source_crl_distance
+        * optimize_distance
+        / (source_crl_distance + optimize_distance)
+    )
+
+    lenses = _load_lens_table()
+    powers = 2 * lenses.number * delta / lenses.radius  # 1/focus
+
+    if selected_lenses is None:
+        rows, best_focal_length = _find_optimal_combination(
+            powers, lenses.distance, f_eff
+        )
+        best_combination = tuple(lenses.index[rows].tolist())
+    else:
+        row_of = {label: row for row, label in enumerate(lenses.index)}
+        rows = [row_of[label] for label in selected_lenses]
+        best_combination = selected_lenses
+        best_focal_length = _compute_effective_focal_length(
+            powers[rows], lenses.distance[rows]
+        )
+
+    # Calculating some extra parameters
+    best_effective_radius = 2 * delta * best_focal_length
+
+    # The calculation is based on the center of the selected stack which may
+    # not be the same as the center of the transfocator, weighted by power
+    # (delta cancels out of the weights).
+    power = powers[rows]
+    effective_center = power @ lenses.distance[rows] / power.sum()
+
+    crl_center = source_crl_distance + effective_center
+    best_sample_distance = (
+        best_focal_length * crl_center / (crl_center - best_focal_length)
+    )
+    # correct for lens selection
+    effective_reference_distance = reference_distance - effective_center / 1e3
+    # get relative position
+    crlz_position = effective_reference_distance - best_sample_distance / 1e3
+
+    return (
+        best_combination,
+        best_effective_radius,
+        best_sample_distance,
+        crlz_position,
     )
 
 
@@ -175,52 +314,19 @@ def transfocator_calculation(
             "(diffractometer) or 73.3 m (magnet)."
         )
 
-    delta = read_delta(energy * 1e3)  # delta table uses eV.
-
-    # Effective focal point for the desired distance
-
-    optimize_distance = (
-        optimize_position + reference_distance
-    ) * 1e3  # microns
-
-    source_crl_distance = source_sample_distance - optimize_distance
-    f_eff = (
-        source_crl_distance
-        * optimize_distance
-        / (source_crl_distance + optimize_distance)
-    )
-
-    lenses = read_csv(LENS_SETTINGS, skiprows=1).set_index("index")
-
-    lenses["focus"] = lenses["single_lens_radius"] / (
-        2 * lenses["number_of_lenses"] * delta
+    (
+        best_combination,
+        best_effective_radius,
+        best_sample_distance,
+        crlz_position,
+    ) = _compute_solution(
+        energy,
+        optimize_position,
+        source_sample_distance,
+        reference_distance,
+        tuple(selected_lenses) if distance_only else None,
     )
-
-    if not distance_only:
-        best_combination, best_focal_length = _find_optimal_combination(
-            lenses, f_eff
-        )
-    else:
-        best_combination = selected_lenses
-        best_focal_length = _find_optimal_focus(lenses.loc[selected_lenses])
-
-    # Calculating some extra parameters
-    best_effective_radius = 2 * delta * best_focal_length
-
-    # The calculation is based on the center of the selected stack which may
-    # not be the same as the center of the transfocator.
-    _selected = lenses.loc[best_combination]
-    power = _selected["number_of_lenses"] * 2 / _selected["single_lens_radius"]
-    effective_center = (power * _selected["distance"]).sum() / power.sum()
-
-    crl_center = source_crl_distance + effective_center
-    best_sample_distance = (
-        best_focal_length * crl_center / (crl_center - best_focal_length)
-    )
-    # correct for lens selection
-    effective_reference_distance = reference_distance - effective_center / 1e3
-    # get relative position
-    crlz_position = effective_reference_distance - best_sample_distance / 1e3
+    best_combination = list(best_combination)
 
     if verbose:
         print("-" * 65)
@@ -1,27 +1,179 @@
-"""Motor position display utilities (wm, wax, wa_scan, wa_new)."""
+"""Motor position display utilities (wm, wax, wa_scan, wa_multi, wa_new)."""
 
+import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from numbers import Real
 
 from apsbits.core.instrument_init import oregistry
+from ophyd.utils.errors import DisconnectedError
 from polartools.load_data import load_catalog
-from pyRestTable import Table
 
-cat = load_catalog("4id_polar")
+# Signals read for each motor: position and travel limits.
+_MOTOR_SIGNALS = ("user_readback", "low_limit_travel", "high_limit_travel")
+# Threads for devices read signal by signal.
+_READ_WORKERS = 32
+# Threads for baseline reads of different scans.
+_BASELINE_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
+def _catalog():
+    """Return the 4id_polar catalog, opened on first use."""
+    return load_catalog("4id_polar")
+
+
+def _get_signals(signals, **kwargs):
+    """
+    Return the values of signals, or None if any could not be read or is not
+    a number (e.g. a soft signal that was never set).
+    """
+    try:
+        values = tuple(sig.get(**kwargs) for sig in signals)
+    except (TimeoutError, DisconnectedError):
+        return None
+    if not all(isinstance(value, Real) for value in values):
+        return None
+    return values
+
+
+def _read_motors(devices):
+    """
+    Return the (position, low limit, high limit) of each device, or None if
+    it could not be read as numbers.
+
+    EpicsMotor monitors these signals, so their values are taken from the
+    monitor cache with no Channel Access traffic. A device whose PVs are not
+    connected is reported as unreadable right away, rather than after a read
+    has timed out. Devices without PVs (e.g. soft or derived motors) are read
+    signal by signal, all devices concurrently.
+    """
+    values = [None] * len(devices)
+    direct = {}  # device index -> signals read with get()
+    for i, dev in enumerate(devices):
+        try:
+            signals = [getattr(dev, attr) for attr in _MOTOR_SIGNALS]
+        except AttributeError:
+            continue
+        if any(getattr(sig, "pvname", None) is None for sig in signals):
+            direct[i] = signals
+        elif all(sig.connected for sig in signals):
+            values[i] = _get_signals(signals, use_monitor=True)
+
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        direct_values = pool.map(_get_signals, direct.values())
+        for i, result in zip(direct, direct_values, strict=True):
+            values[i] = result
+    return values
+
+
+def _markdown_table(labels, rows):
+    """
+    Return a markdown table of rows of strings, in the same layout as
+    ``pyRestTable.Table.reST(fmt="markdown")``.
+    """
+    widths = [
+        max(3, len(label), *(len(row[col]) for row in rows))
+        for col, label in enumerate(labels)
+    ]
+    fmt = "| " + " | ".join(f"{{:<{width}}}" for width in widths) + " |"
+    lines = [fmt.format(*labels)]
+    lines.append("| " + " | ".join("-" * width for width in widths) + " |")
+    lines.extend(fmt.format(*row) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def _name_pattern(motor):
+    """
+    Return a compiled pattern that finds any of the motor name fragments, or
+    None if there is no filter.
+
+    motor can be a single fragment, several fragments, or an ``re.Pattern``
+    used as given.
+    """
+    if not motor or isinstance(motor, re.Pattern):
+        return motor or None
+    if isinstance(motor, str):
+        motor = [motor]
+    return re.compile("|".join(map(re.escape, motor)))
+
+
+def _read_baseline(catalog, scan, names):
+    """
+    Return the fields in names of the baseline stream of a scan of catalog,
+    read once for all devices.
+
+    Only these fields are converted, not every device of the baseline. A scan
+    that cannot be read gives an empty baseline, so that every device is
+    reported as missed.
+    """
+    if not names:
+        # An empty include selects every field.
+        return {}
+    try:
+        return catalog[scan].baseline(include=list(names)).read()
+    except (KeyError, AttributeError):
+        return {}
+
+
+def _baseline_rows(devices, scan, motor=None):
+    """
+    Return table rows of the values in the baseline of a scan of the devices
+    whose name matches motor, and the names of those not found there.
+    """
+    rows = []
+    missed = []
+    pattern = _name_pattern(motor)
+    if pattern is not None:
+        devices = [arg for arg in devices if pattern.search(arg.name)]
+    with warnings.catch_warnings():
+        warnings.simplefilter(action="ignore", category=FutureWarning)
+        baseline = _read_baseline(
+            _catalog(), scan, [arg.name for arg in devices]
+        )
+    for arg in devices:
+        try:
+            rows.append((arg.name, f"{baseline[arg.name].values[0]}"))
+        except KeyError:
+            missed.append(arg.name)
+    return rows, missed
+
+
+def _position_rows(devices, motor=None):
+    """
+    Return table rows of the current position and limits of the devices
+    whose name matches motor, and the names of those that could not be read.
+    """
+    rows = []
+    missed = []
+    pattern = _name_pattern(motor)
+    if pattern is not None:
+        devices = [arg for arg in devices if pattern.search(arg.name)]
+    for arg, values in zip(devices, _read_motors(devices), strict=True):
+        if values is None:
+            missed.append(arg.name)
+            continue
+        pos, llm, hlm = values
+        rows.append((arg.name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]"))
+    return rows, missed
 
 
 def wm(*args):
     """
     Print a table of current position and travel limits for the given motors.
     """
-    result = Table()
-    result.labels = ("Motor", "Position", "Limits")
-    for arg in args:
-        pos = arg.user_readback.get()
-        llm = arg.low_limit_travel.get()
-        hlm = arg.high_limit_travel.get()
-        result.rows.append((arg.name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]"))
+    rows = []
+    labels = ("Motor", "Position", "Limits")
+    for arg, values in zip(args, _read_motors(args), strict=True):
+        if values is None:
+            rows.append((arg.name, "n/a", "n/a"))
+            continue
+        pos, llm, hlm = values
+        rows.append((arg.name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]"))
     print("")
-    print(result.reST(fmt="markdown"))
+    print(_markdown_table(labels, rows))
 
 
 def wax(scan=None, motor=None, device="motor", display_missed=False):
@@ -32,8 +184,10 @@ def wax(scan=None, motor=None, device="motor", display_missed=False):
     ----------
         scan number : int, optional
             Scan number of any scan
-        motor name : string, optional
-            If None all motor positions will be deisplayed.
+        motor name : string, list of strings or re.Pattern, optional
+            Only devices whose name contains any of the strings, or matches
+            the pattern, are displayed. If None all motor positions will be
+            deisplayed.
         device name: string: optional
             Default' is "motor", used to find devices in the registry.
             Other possibilities include "detector", "sensor", "actuator", etc.
@@ -44,108 +198,37 @@ def wax(scan=None, motor=None, device="motor", display_missed=False):
         wa('motor'): current position of motors containing 'motor'
         wa(42, 'motor'): current position of motors containing 'motor' of scan
         wa(42): current position of all motors in scan 42
+        wa(['huber', 'mono']): current position of motors containing 'huber'
+            or 'mono'
 
     """
-    result = Table()
     devices = oregistry.findall(device)
-    missed = []
-    warnings.simplefilter(action="ignore", category=FutureWarning)
     if isinstance(scan, int):
-        result.labels = ("Device name", "Position")
-        for arg in devices:
-            try:
-                name = arg.name
-                if motor:
-                    pos = cat[scan].baseline.read()[name]
-
-                    if motor in pos.name:
-                        result.rows.append((name, f"{pos.values[0]}"))
-                else:
-                    pos = cat[scan].baseline.read()[name]
-                    result.rows.append((name, f"{pos.values[0]}"))
-            except Exception:
-                missed.append(arg.name)
+        labels = ("Device name", "Position")
+        rows, missed = _baseline_rows(devices, scan, motor)
         print("")
         print(f"Values from scan #{scan}")
-        print("")
-        print(result.reST(fmt="markdown"))
-        if len(missed) and display_missed > 0:
-            print(f"{len(missed)} more devices:")
-            print(f"{missed}")
-    elif isinstance(scan, str):
-        motor = scan
-        result.labels = ("Device name", "Position", "Limits")
-        for arg in devices:
-            if motor in arg.name:
-                # print(motor, arg.name)
-                try:
-                    pos = arg.user_readback.get()
-                    llm = arg.low_limit_travel.get()
-                    hlm = arg.high_limit_travel.get()
-                    name = arg.name
-                    result.rows.append(
-                        (name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]")
-                    )
-                    # print(arg)
-                except Exception:
-                    missed.append(arg.name)
-        print("")
-        print(result.reST(fmt="markdown"))
-        if len(missed) and display_missed > 0:
-            print(f"{len(missed)} more devices:")
-            print(f"{missed}")
     else:
-        result.labels = ("Device name", "Position", "Limits")
-        for arg in devices:
-            try:
-                pos = arg.user_readback.get()
-                llm = arg.low_limit_travel.get()
-                hlm = arg.high_limit_travel.get()
-                name = arg.name
-                if motor:
-                    if motor in name:
-                        result.rows.append(
-                            (name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]")
-                        )
-                else:
-                    result.rows.append(
-                        (name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]")
-                    )
-
-            except Exception:
-                missed.append(arg.name)
-
-        print("")
-        print(result.reST(fmt="markdown"))
-        if len(missed) and display_missed > 0:
-            print(f"{len(missed)} more devices:")
-            print(f"{missed}")
+        if isinstance(scan, (str, list, tuple, re.Pattern)):
+            motor = scan
+        labels = ("Device name", "Position", "Limits")
+        rows, missed = _position_rows(devices, motor)
+    print("")
+    print(_markdown_table(labels, rows))
+    if len(missed) and display_missed > 0:
+        print(f"{len(missed)} more devices:")
+        print(f"{missed}")
 
 
 def wa_scan(scan=None, motor=None):
     """Print motor positions recorded in the baseline stream of a past scan."""
-    result = Table()
-    result.labels = ("Motor", "Position")
-    devices = oregistry.findall("motor")
-    missed = []
+    labels = ("Motor", "Position")
     if scan:
-        for arg in devices:
-            try:
-                name = arg.name
-                if motor:
-                    pos = cat[scan].baseline.read()[name]
-
-                    if motor in pos.name:
-                        result.rows.append((name, f"{pos.values[0]}"))
-                else:
-                    pos = cat[scan].baseline.read()[name]
-                    result.rows.append((name, f"{pos.values[0]}"))
-            except Exception:
-                missed.append(arg.name)
+        rows, missed = _baseline_rows(oregistry.findall("motor"), scan, motor)
         print("")
         print(f"Motor positions from scan #{scan}")
         print("")
-        print(result.reST(fmt="markdown"))
+        print(_markdown_table(labels, rows))
         print(f"{len(missed)} motors missed:")
         print(f"Motors missed {missed}")
     else:
@@ -155,34 +238,61 @@ def wa_scan(scan=None, motor=None):
         )
 
 
+def wa_multi(scans, motor=None):
+    """
+    Print motor positions recorded in the baseline stream of several past
+    scans, one column per scan.
+
+    The baselines of all scans are read concurrently.
+
+    EXAMPLES
+    ----------
+        wa_multi([1560, 1561]): positions of all motors in both scans
+        wa_multi([1560, 1561], 'huber'): same, for motors containing 'huber'
+    """
+    scans = list(scans)
+    devices = oregistry.findall("motor")
+    pattern = _name_pattern(motor)
+    if pattern is not None:
+        devices = [arg for arg in devices if pattern.search(arg.name)]
+    names = [arg.name for arg in devices]
+    # The warning filters are process wide: set them around the whole pool,
+    # not in each thread.
+    with warnings.catch_warnings():
+        warnings.simplefilter(action="ignore", category=FutureWarning)
+        # Open the catalog here, as the threads below would race to open it.
+        catalog = _catalog()
+        with ThreadPoolExecutor(max_workers=_BASELINE_WORKERS) as pool:
+            baselines = list(
+                pool.map(_read_baseline, repeat(catalog), scans, repeat(names))
+            )
+
+    labels = ("Motor", *(f"#{scan}" for scan in scans))
+    rows = []
+    missed = []
+    for name in names:
+        values = [
+            f"{baseline[name].values[0]}" if name in baseline else "n/a"
+            for baseline in baselines
+        ]
+        if all(value == "n/a" for value in values):
+            missed.append(name)
+        else:
+            rows.append((name, *values))
+    print("")
+    print(_markdown_table(labels, rows))
+    print(f"{len(missed)} motors missed:")
+    print(f"Motors missed {missed}")
+
+
 def wa_new(motor=None):
     """
     Print current position and limits for all motors, optionally filtered by
     name.
     """
-    result = Table()
-    result.labels = ("Motor", "Position", "Limits")
-    devices = oregistry.findall("motor")
-    missed = []
-    for arg in devices:
-        try:
-            pos = arg.user_readback.get()
-            llm = arg.low_limit_travel.get()
-            hlm = arg.high_limit_travel.get()
-            name = arg.name
-            if motor:
-                if motor in name:
-                    result.rows.append(
-                        (name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]")
-                    )
-            else:
-                result.rows.append(
-                    (name, f"{pos:.5f}", f"[{llm:.5f},{hlm:.5f}]")
-                )
-
-        except Exception:
-            missed.append(arg.name)
+    labels = ("Motor", "Position", "Limits")
+    rows, missed = _position_rows(oregistry.findall("motor"), motor)
     print("")
-    print(result.reST(fmt="markdown"))
+    print(_markdown_table(labels, rows))
     print(f"{len(missed)} motors missed:")
     print(f"Motors missed {missed}")
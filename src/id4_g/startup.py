@@ -38,8 +38,7 @@ make_devices(  # noqa: F405
     device_manager=instrument,  # noqa: F405
     connect=False,
 )
-for device in oregistry.findall(["core", "4idg"]):  # noqa: F405
-    connect_device(device, raise_error=False)  # noqa: F405
+connect_devices(oregistry.findall(["core", "4idg"]))  # noqa: F405
 
 counters.plotselect(14, 5)  # noqa: F405
 
@@ -45,17 +45,19 @@ iconfig = get_config()
 logger.info("Starting Instrument with iconfig: %s", iconfig_path)
 
 instrument, oregistry = init_instrument("guarneri")
-oregistry.clear()
 
 # Configure the session with callbacks, devices, and plans.
 aps_dm_setup(iconfig.get("DM_SETUP_FILE"))
 
-# Command-line tools, such as %wa, %ct, ...
-register_bluesky_magics()
-
 from id4_common.utils.local_magics import LocalMagics  # noqa: E402
 
-get_ipython().register_magics(LocalMagics)
+# A reload (e.g. %autoreload) keeps the module globals: do not empty the
+# device registry or register the command-line tools (%wa, %ct, ...) again.
+if not globals().get("_startup_done", False):
+    oregistry.clear()
+    register_bluesky_magics()
+    get_ipython().register_magics(LocalMagics)
+    _startup_done = True
 
 # Initialize core bluesky components
 from id4_common.utils.run_engine import RE  # noqa: E402
@@ -127,6 +129,7 @@ else:
     from id4_common.utils.experiment_utils import *  # noqa: F403
     from id4_common.utils.hkl_utils_hklpy2 import *  # noqa: F403
     from id4_common.utils.pr_setup import pr_setup  # noqa: F401
+    from id4_common.utils.wax import wa_multi  # noqa: F401
     from id4_common.utils.wax import wa_new  # noqa: F401
     from id4_common.utils.wax import wax  # noqa: F401
     from id4_common.utils.wax import wm  # noqa: F401
@@ -137,7 +140,8 @@ else:
     logger.setLevel(logging.DEBUG)
 
     from id4_common.plans import *  # noqa: F403
-    from id4_common.utils.device_loader import connect_device
+    from id4_common.utils.device_loader import connect_device  # noqa: F401
+    from id4_common.utils.device_loader import connect_devices
     from id4_common.utils.device_loader import (  # noqa: F401
         find_loadable_devices,
     )
@@ -145,6 +149,9 @@ else:
     from id4_common.utils.device_loader import load_yaml_devices  # noqa: F401
     from id4_common.utils.device_loader import reload_all_devices  # noqa: F401
     from id4_common.utils.device_loader import remove_device  # noqa: F401
+    from id4_common.utils.load_vortex import (
+        join_vortex_connections,  # noqa: F401
+    )
     from id4_common.utils.load_vortex import load_vortex  # noqa: F401
     from id4_common.utils.oregistry_auxiliar import get_devices  # noqa: F401
     from id4_common.utils.polartools_hklpy_imports import *  # noqa: F403
@@ -154,8 +161,7 @@ make_devices(
     clear=True, file="devices.yml", device_manager=instrument, connect=False
 )
 stations = ["4idb"]
-for device in oregistry.findall(stations):
-    connect_device(device, raise_error=False)
+connect_devices(oregistry.findall(stations))
 
 counters.plotselect(11, 0)
 
@@ -0,0 +1,82 @@
+"""Tests for the orienting-reflection helpers of hkl_utils_hklpy2."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+hklpy2 = pytest.importorskip("hklpy2")
+
+# Silicon (a = 5.431 A) at 1.54 A: the 400-type reflections of the hklpy2
+# E4CV examples, as (omega, chi, phi, tth).
+_SI_A = 5.431
+_WAVELENGTH = 1.54
+_POS_400 = (-145.451, 0.0, 0.0, 69.0966)
+_POS_040 = (-145.451, 0.0, 90.0, 69.0966)
+_POS_004 = (-145.451, 90.0, 0.0, 69.0966)
+
+
+@pytest.fixture
+def hkl_utils(monkeypatch):
+    """Return hkl_utils_hklpy2 driving a simulated E4CV diffractometer."""
+    try:
+        sim = hklpy2.creator(name="sim", geometry="E4CV", solver="hkl_soleil")
+    except Exception as exc:  # libhkl (gi) is not available
+        pytest.skip(f"hkl_soleil solver unavailable: {exc}")
+    sim.add_sample("silicon", _SI_A)
+    sim.beam.wavelength.put(_WAVELENGTH)
+
+    import id4_common.utils.hkl_utils_hklpy2 as mod
+
+    monkeypatch.setattr(mod, "get_diffractometer", lambda: sim, raising=False)
+    monkeypatch.setattr(mod, "_psi_geometry", lambda geom: None)
+    monkeypatch.setattr(mod, "Sync_UB_Matrix", MagicMock())
+    monkeypatch.setitem(mod._LAST_UB, "inputs", None)
+    monkeypatch.setitem(mod._LAST_UB, "UB", None)
+    return mod, sim
+
+
+def _move(sim, position):
+    for axis, value in zip(sim.real_axis_names, position, strict=True):
+        getattr(sim, axis).move(value)
+
+
+def test_or0_or1_set_orienting_pair_and_ub(hkl_utils):
+    mod, sim = hkl_utils
+    sample = sim.sample
+
+    _move(sim, _POS_400)
+    mod.or0(4, 0, 0)
+    _move(sim, _POS_040)
+    mod.or1(0, 4, 0)
+    r400, r040 = sample.reflections.order[:2]
+    assert sample.reflections[r400].pseudos["h"] == 4
+    assert sample.reflections[r040].pseudos["k"] == 4
+    ub = np.array(sample.UB)
+
+    # A new primary reflection replaces the first of the pair only.
+    _move(sim, _POS_400)
+    mod.or0(0, 0, 4)
+    r004 = next(key for key in sample.reflections if key not in (r400, r040))
+    assert sample.reflections.order[:2] == [r004, r040]
+    assert not np.allclose(sample.UB, ub)
+
+    # And a new secondary reflection replaces the second one.
+    ub = np.array(sample.UB)
+    _move(sim, _POS_004)
+    mod.or1(0, 4, 0)
+    assert sample.reflections.order[0] == r004
+    assert sample.reflections.order[1] not in (r400, r040, r004)
+    assert not np.allclose(sample.UB, ub)
+
+
+def test_promote_to_slot_keeps_replaced_reflection():
+    from id4_common.utils.hkl_utils_hklpy2 import _promote_to_slot
+
+    assert _promote_to_slot(["a", "b", "c"], "c", 0) == ["c", "b", "a"]
+    assert _promote_to_slot(["a", "b", "c"], "c", 1) == ["a", "c", "b"]
+    assert _promote_to_slot(["a", "b"], "b", 0) == ["b", "a"]
+    assert _promote_to_slot(["a", "b"], "b", 1) == ["a", "b"]
+    assert _promote_to_slot(["a"], "a", 1) == ["a"]
@@ -0,0 +1,120 @@
+"""Tests for id4_common.utils.spe_handler."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("area_detector_handlers")
+pytest.importorskip("imageio")
+
+from id4_common.utils.spe_handler import SPEHandler  # noqa: E402
+from id4_common.utils.spe_handler import read_spe  # noqa: E402
+
+# SPE datatype code -> pixel dtype, as written by WinView/LightField.
+_DATATYPES = {
+    0: np.float32,
+    1: np.int32,
+    2: np.int16,
+    3: np.uint16,
+    5: np.float64,
+    6: np.uint8,
+    8: np.uint32,
+}
+
+
+def _write_spe(path, frames, datatype, version=3.0, footer=b"", stride=None):
+    """Write ``frames`` (n, y, x) as a minimal SPE file.
+
+    ``stride`` is the number of bytes per frame on disk (per-frame metadata
+    pads each frame); by default frames are stored back to back.
+    """
+    nframes, ydim, xdim = frames.shape
+    header = np.zeros(4100, dtype=np.uint8)
+
+    def put(offset, dtype, value):
+        raw = np.array([value], dtype=dtype).view(np.uint8)
+        header[offset : offset + raw.size] = raw
+
+    put(42, "<u2", xdim)
+    put(108, "<i2", datatype)
+    put(656, "<u2", ydim)
+    put(1446, "<i4", nframes)
+    put(1992, "<f4", version)
+    frame_bytes = frames[0].nbytes
+    stride = frame_bytes if stride is None else stride
+    data = b"".join(
+        frame.tobytes() + b"\0" * (stride - frame_bytes) for frame in frames
+    )
+    if footer:
+        put(678, "<u8", 4100 + len(data))
+    path.write_bytes(header.tobytes() + data + footer)
+    return path
+
+
+def _frames(dtype, nframes=3, ydim=4, xdim=5):
+    values = np.arange(nframes * ydim * xdim) % 200
+    return values.reshape(nframes, ydim, xdim).astype(dtype)
+
+
+@pytest.mark.parametrize("datatype", sorted(_DATATYPES))
+def test_read_spe_dtypes(tmp_path, datatype):
+    frames = _frames(_DATATYPES[datatype])
+    fname = _write_spe(tmp_path / "img.spe", frames, datatype, version=2.5)
+
+    data = read_spe(str(fname))
+
+    assert isinstance(data, np.memmap)
+    assert data.shape == (3, 4, 5)
+    assert data.dtype == frames.dtype
+    np.testing.assert_array_equal(data, frames)
+
+
+def test_read_spe_stops_at_xml_footer(tmp_path):
+    frames = _frames(np.uint16)
+    fname = _write_spe(
+        tmp_path / "img.spe", frames, 3, footer=b"<SpeFormat></SpeFormat>"
+    )
+
+    data = read_spe(str(fname))
+
+    assert isinstance(data, np.memmap)
+    np.testing.assert_array_equal(data, frames)
+
+
+def test_read_spe_padded_frames_use_imageio(tmp_path, monkeypatch):
+    import id4_common.utils.spe_handler as spe_handler
+
+    frames = _frames(np.uint16)
+    fname = _write_spe(
+        tmp_path / "img.spe",
+        frames,
+        3,
+        footer=b"<SpeFormat></SpeFormat>",
+        stride=frames[0].nbytes + 8,
+    )
+    calls = []
+
+    def fake_imread(path):
+        calls.append(path)
+        return frames
+
+    monkeypatch.setattr(spe_handler, "imread", fake_imread)
+
+    data = read_spe(str(fname))
+
+    assert calls == [str(fname)]
+    np.testing.assert_array_equal(data, frames)
+
+
+def test_handler_returns_frames_and_checks_count(tmp_path):
+    frames = _frames(np.uint16, nframes=2)
+    for point in range(2):
+        _write_spe(tmp_path / f"scan_{point:03d}.spe", frames + point, 3)
+
+    handler = SPEHandler(str(tmp_path), "%s%s_%03d.spe", "scan", 2)
+    np.testing.assert_array_equal(handler(1), frames + 1)
+    np.testing.assert_array_equal(handler(0), frames)
+
+    with pytest.raises(ValueError):
+        SPEHandler(str(tmp_path), "%s%s_%03d.spe", "scan", 3)(0)
@@ -0,0 +1,59 @@
+"""Tests for id4_common.utils.transfocator_calculation_new."""
+
+from __future__ import annotations
+
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from id4_common.utils import transfocator_calculation_new as tc
+
+# The lens table shipped with the package.
+SETTINGS = Path(tc.__file__).parent / "transfocator_settings.csv"
+
+
+def _exhaustive_best(powers, positions, f_eff):
+    """Return the smallest |focal length - f_eff| over every lens subset."""
+    best = np.inf
+    for n in range(1, len(powers) + 1):
+        for rows in combinations(range(len(powers)), n):
+            rows = list(rows)
+            focal_length = tc._compute_effective_focal_length(
+                powers[rows], positions[rows]
+            )
+            best = min(best, abs(focal_length - f_eff))
+    return best
+
+
+def _check_against_exhaustive_search(delta, focal_lengths):
+    """Compare the lens search with _exhaustive_best for each target."""
+    lenses = tc._load_lens_table(str(SETTINGS))
+    powers = 2 * lenses.number * delta / lenses.radius
+    positions = lenses.distance
+
+    for f_eff in focal_lengths:
+        rows, focal_length = tc._find_optimal_combination(
+            powers, positions, f_eff
+        )
+        assert focal_length == pytest.approx(
+            tc._compute_effective_focal_length(powers[rows], positions[rows])
+        )
+        assert abs(focal_length - f_eff) == pytest.approx(
+            _exhaustive_best(powers, positions, f_eff), rel=1e-9, abs=1e-6
+        )
+
+
+@pytest.mark.parametrize("delta", np.geomspace(5e-7, 5e-5, 6))
+def test_find_optimal_combination_matches_exhaustive_search(delta):
+    # Target focal lengths from 0.1 m to 50 m (in microns).
+    _check_against_exhaustive_search(delta, np.geomspace(1e5, 5e7, 30))
+
+
+@pytest.mark.parametrize("delta", np.geomspace(5e-7, 5e-5, 6))
+def test_meet_in_the_middle_search_for_long_focal_lengths(monkeypatch, delta):
+    # Force the pruned search used for large stacks; it is exact once the
+    # lens spacing is small next to the focal length (0.5 m to 50 m).
+    monkeypatch.setattr(tc, "_EXHAUSTIVE_MAX_LENSES", 0)
+    _check_against_exhaustive_search(delta, np.geomspace(5e5, 5e7, 30))